@@ -15,6 +15,8 @@ class User(AbstractUser):
         ('admin', 'Administrator'),
     ]
 
+    MANAGEMENT_ROLES = frozenset({'owner', 'manager', 'admin'})
+
     email = models.EmailField(_('email address'), unique=True)
     role = models.CharField(
         max_length=20,
@@ -84,6 +86,10 @@ class User(AbstractUser):
     def is_admin(self):
         return self.role == 'admin'
 
+    @property
+    def is_manager_or_above(self):
+        return self.role in self.MANAGEMENT_ROLES
+
     # MFA methods
     def enable_mfa(self, method='totp'):
         """Enable MFA for the user"""
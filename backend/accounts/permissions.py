@@ -20,7 +20,7 @@ class IsManagerOrAbove(permissions.BasePermission):
     def has_permission(self, request, view):
         if not request.user or not request.user.is_authenticated:
             return False
-        return request.user.is_manager or request.user.is_owner or request.user.is_admin
+        return request.user.is_manager_or_above
 
 
 class IsTechnicianOrAbove(permissions.BasePermission):
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.24 on 2026-10-16 14:05
+
+from django.db import migrations
+
+# Trigram GIN index for icontains searches on customer names (customer and
+# job list search). PostgreSQL only; other backends skip it.
+CREATE_SQL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS customers_name_trgm_idx ON customers_customer "
+    "USING gin (UPPER(first_name) gin_trgm_ops, UPPER(last_name) gin_trgm_ops)",
+]
+DROP_SQL = ["DROP INDEX IF EXISTS customers_name_trgm_idx"]
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        for sql in CREATE_SQL:
+            schema_editor.execute(sql)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        for sql in DROP_SQL:
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("customers", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
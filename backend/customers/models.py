@@ -91,7 +91,9 @@ class Customer(models.Model):
 
     @property
     def primary_address(self):
-        """Get the primary address for this customer"""
+        """Get the primary address for this customer (uses prefetched addresses when available)"""
+        if 'addresses' in getattr(self, '_prefetched_objects_cache', {}):
+            return next((address for address in self.addresses.all() if address.is_primary), None)
         return self.addresses.filter(is_primary=True).first()
 
     @property
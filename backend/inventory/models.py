@@ -1,5 +1,8 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
 from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from decimal import Decimal
 from django.core.validators import MinValueValidator
@@ -38,11 +41,39 @@ class InventoryCategory(models.Model):
         verbose_name = 'Inventory Category'
         verbose_name_plural = 'Inventory Categories'
 
+    ACTIVE_CACHE_KEY = 'inventory:active_categories'
+    ACTIVE_CACHE_TIMEOUT = 3600
+
     def __str__(self):
         if self.parent_category:
             return f"{self.parent_category.name} > {self.name}"
         return self.name
 
+    @classmethod
+    def get_active_ids(cls, parent=None):
+        """
+        Return ids of active categories, optionally limited to one parent.
+        The id -> parent map is cached and cleared by the inventory signals.
+        """
+        active = cache.get(cls.ACTIVE_CACHE_KEY)
+        if active is None:
+            active = dict(
+                cls.objects.filter(is_active=True).values_list('id', 'parent_category_id')
+            )
+            cache.set(cls.ACTIVE_CACHE_KEY, active, cls.ACTIVE_CACHE_TIMEOUT)
+
+        if parent is None:
+            return list(active)
+        return [
+            category_id for category_id, parent_id in active.items()
+            if str(parent_id) == str(parent)
+        ]
+
+    @classmethod
+    def clear_active_cache(cls):
+        """Drop the cached active category map"""
+        cache.delete(cls.ACTIVE_CACHE_KEY)
+
 
 class Supplier(models.Model):
     """
@@ -294,21 +325,28 @@ class InventoryItem(models.Model):
     def update_stock(self, quantity_change, reason='', reference='', user=None):
         """
         Update stock quantity with audit trail.
+        The change is applied as a single atomic UPDATE so concurrent
+        adjustments cannot overwrite each other.
         """
-        old_quantity = self.current_stock
-        self.current_stock += quantity_change
-        self.save()
-
-        # Create stock transaction record
-        StockTransaction.objects.create(
-            item=self,
-            transaction_type='adjustment' if quantity_change != 0 else 'count',
-            quantity_change=quantity_change,
-            new_quantity=self.current_stock,
-            reason=reason,
-            reference=reference,
-            performed_by=user
-        )
+        with transaction.atomic():
+            InventoryItem.objects.filter(pk=self.pk).update(
+                current_stock=F('current_stock') + quantity_change,
+                updated_at=timezone.now()
+            )
+            self.current_stock = InventoryItem.objects.values_list(
+                'current_stock', flat=True
+            ).get(pk=self.pk)
+
+            # Create stock transaction record
+            StockTransaction.objects.create(
+                item=self,
+                transaction_type='adjustment' if quantity_change != 0 else 'count',
+                quantity_change=quantity_change,
+                new_quantity=self.current_stock,
+                reason=reason,
+                reference=reference,
+                performed_by=user
+            )
 
         return self.current_stock
 
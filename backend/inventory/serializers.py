@@ -74,6 +74,16 @@ class InventoryItemSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at', 'stock_status', 'stock_value', 'needs_reorder']
 
 
+class InventoryItemListSerializer(InventoryItemSerializer):
+    """Lightweight serializer for inventory item listings (no long text fields)"""
+
+    class Meta(InventoryItemSerializer.Meta):
+        fields = [
+            field for field in InventoryItemSerializer.Meta.fields
+            if field != 'description'
+        ]
+
+
 class StockTransactionSerializer(serializers.ModelSerializer):
     """Serializer for stock transactions"""
     item_name = serializers.CharField(source='item.name', read_only=True)
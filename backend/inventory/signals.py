@@ -1,8 +1,8 @@
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_save, post_delete, pre_save
 from django.dispatch import receiver
 from quotes.models import QuoteItem
 from jobs.models import Job
-from .models import InventoryItem, StockTransaction
+from .models import InventoryCategory, InventoryItem, StockTransaction
 
 
 @receiver(post_save, sender=QuoteItem)
@@ -60,3 +60,12 @@ def track_inventory_changes(sender, instance, **kwargs):
                 pass
         except InventoryItem.DoesNotExist:
             pass
+
+
+@receiver(post_save, sender=InventoryCategory)
+@receiver(post_delete, sender=InventoryCategory)
+def clear_active_category_cache(sender, instance, **kwargs):
+    """
+    Invalidate the cached active category map when a category changes.
+    """
+    InventoryCategory.clear_active_cache()
@@ -38,6 +38,20 @@ class InventoryCategoryTestCase(TestCase):
         self.assertEqual(child.parent_category, parent)
         self.assertEqual(str(child), 'Materials > Roofing')
 
+    def test_active_ids_cache_invalidation(self):
+        """Test the active category cache follows saves"""
+        parent = InventoryCategory.objects.create(name='Materials')
+        child = InventoryCategory.objects.create(name='Roofing', parent_category=parent)
+
+        self.assertCountEqual(InventoryCategory.get_active_ids(), [parent.id, child.id])
+        self.assertEqual(InventoryCategory.get_active_ids(parent.id), [child.id])
+
+        child.is_active = False
+        child.save()
+
+        self.assertEqual(InventoryCategory.get_active_ids(), [parent.id])
+        self.assertEqual(InventoryCategory.get_active_ids(parent.id), [])
+
 
 class SupplierTestCase(TestCase):
     """Test cases for Supplier model"""
@@ -386,4 +400,60 @@ class InventoryAPITestCase(APITestCase):
         response = self.client.get('/api/inventory/reports/summary/')
         self.assertEqual(response.status_code, 200)
         self.assertIn('total_items', response.data)
-        self.assertIn('total_value', response.data)
\ No newline at end of file
+        self.assertIn('total_value', response.data)
+
+    def test_receive_items_rejects_over_receipt(self):
+        """Test receiving more than the remaining quantity is rejected without partial updates"""
+        supplier = Supplier.objects.create(name='Receipt Supplier')
+        item = InventoryItem.objects.create(
+            name='Receipt Item',
+            sku='RECEIPT-001',
+            category=self.category,
+            current_stock=Decimal('0.00'),
+            created_by=self.user
+        )
+        other_item = InventoryItem.objects.create(
+            name='Other Receipt Item',
+            sku='RECEIPT-002',
+            category=self.category,
+            current_stock=Decimal('0.00'),
+            created_by=self.user
+        )
+        po = PurchaseOrder.objects.create(supplier=supplier, created_by=self.user)
+        po_item = PurchaseOrderItem.objects.create(
+            purchase_order=po,
+            inventory_item=item,
+            quantity_ordered=Decimal('10.00'),
+            unit_price=Decimal('5.00')
+        )
+        other_po_item = PurchaseOrderItem.objects.create(
+            purchase_order=po,
+            inventory_item=other_item,
+            quantity_ordered=Decimal('5.00'),
+            unit_price=Decimal('5.00')
+        )
+
+        data = {'items': [
+            {'id': po_item.id, 'quantity_received': 4},
+            {'id': other_po_item.id, 'quantity_received': 6},
+        ]}
+        response = self.client.post(
+            f'/api/inventory/purchase-orders/{po.id}/receive_items/', data, format='json'
+        )
+        self.assertEqual(response.status_code, 400)
+
+        po_item.refresh_from_db()
+        self.assertEqual(po_item.quantity_received, Decimal('0.00'))
+
+        data['items'][1]['quantity_received'] = 5
+        response = self.client.post(
+            f'/api/inventory/purchase-orders/{po.id}/receive_items/', data, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+
+        po_item.refresh_from_db()
+        item.refresh_from_db()
+        po.refresh_from_db()
+        self.assertEqual(po_item.quantity_received, Decimal('4.00'))
+        self.assertEqual(item.current_stock, Decimal('4.00'))
+        self.assertEqual(po.status, 'partially_received')
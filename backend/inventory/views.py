@@ -2,7 +2,8 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Sum, Count, Q, F
+from django.db import transaction
+from django.db.models import Sum, Count, Q, F, Case, When, Value, DecimalField, Prefetch
 from django.utils import timezone
 from decimal import Decimal
 from .models import (
@@ -11,7 +12,7 @@ from .models import (
 )
 from .serializers import (
     InventoryCategorySerializer, SupplierSerializer, InventoryItemSerializer,
-    ItemSupplierSerializer, StockTransactionSerializer, PurchaseOrderSerializer,
+    InventoryItemListSerializer, ItemSupplierSerializer, StockTransactionSerializer, PurchaseOrderSerializer,
     PurchaseOrderCreateSerializer, StockUpdateSerializer, InventoryReportSerializer
 )
 from .permissions import IsOwnerOrManager
@@ -24,11 +25,10 @@ class InventoryCategoryViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated, IsOwnerOrManager]
 
     def get_queryset(self):
-        queryset = InventoryCategory.objects.filter(is_active=True)
-        parent = self.request.query_params.get('parent', None)
-        if parent:
-            queryset = queryset.filter(parent_category_id=parent)
-        return queryset
+        parent = self.request.query_params.get('parent', None) or None
+        return InventoryCategory.objects.filter(
+            id__in=InventoryCategory.get_active_ids(parent)
+        )
 
 
 class SupplierViewSet(viewsets.ModelViewSet):
@@ -47,8 +47,15 @@ class InventoryItemViewSet(viewsets.ModelViewSet):
     serializer_class = InventoryItemSerializer
     permission_classes = [IsAuthenticated, IsOwnerOrManager]
 
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return InventoryItemListSerializer
+        return InventoryItemSerializer
+
     def get_queryset(self):
         queryset = InventoryItem.objects.filter(is_active=True)
+        if self.action == 'list':
+            queryset = queryset.defer('description')
 
         # Filter by category
         category = self.request.query_params.get('category', None)
@@ -140,7 +147,7 @@ class ItemSupplierViewSet(viewsets.ModelViewSet):
         if supplier:
             queryset = queryset.filter(supplier_id=supplier)
 
-        return queryset
+        return queryset.select_related('item', 'supplier').order_by('item_id', 'supplier_id')
 
 
 class StockTransactionViewSet(viewsets.ModelViewSet):
@@ -205,7 +212,11 @@ class PurchaseOrderViewSet(viewsets.ModelViewSet):
         if end_date:
             queryset = queryset.filter(order_date__lte=end_date)
 
-        return queryset
+        return queryset.select_related(
+            'supplier', 'created_by', 'approved_by'
+        ).prefetch_related(
+            Prefetch('items', queryset=PurchaseOrderItem.objects.select_related('inventory_item'))
+        )
 
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
@@ -239,45 +250,65 @@ class PurchaseOrderViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        for item_data in items_data:
-            try:
-                po_item = PurchaseOrderItem.objects.get(
-                    id=item_data['id'],
-                    purchase_order=purchase_order
+        received = {
+            int(item_data['id']): Decimal(str(item_data['quantity_received']))
+            for item_data in items_data
+        }
+        requested = Case(
+            *[When(id=item_id, then=Value(quantity)) for item_id, quantity in received.items()],
+            output_field=DecimalField(max_digits=8, decimal_places=2)
+        )
+
+        with transaction.atomic():
+            po_items = list(
+                PurchaseOrderItem.objects.select_for_update()
+                .filter(purchase_order=purchase_order, id__in=received)
+                .annotate(
+                    requested=requested,
+                    remaining=F('quantity_ordered') - F('quantity_received')
                 )
-                received_quantity = Decimal(str(item_data['quantity_received']))
+                .select_related('inventory_item')
+            )
+
+            found_ids = {po_item.id for po_item in po_items}
+            for item_id in received:
+                if item_id not in found_ids:
+                    return Response(
+                        {'error': f'Purchase order item {item_id} not found'},
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
 
-                if received_quantity > po_item.quantity_remaining:
+            for po_item in po_items:
+                if po_item.requested > po_item.remaining:
                     return Response(
                         {'error': f'Cannot receive more than remaining quantity for {po_item.inventory_item.name}'},
                         status=status.HTTP_400_BAD_REQUEST
                     )
 
-                po_item.quantity_received += received_quantity
-                po_item.save()
+            # Apply all receipts in a single UPDATE
+            PurchaseOrderItem.objects.filter(id__in=found_ids).update(
+                quantity_received=F('quantity_received') + requested
+            )
 
-                # Update inventory stock
+            # Update inventory stock
+            for po_item in po_items:
                 po_item.inventory_item.update_stock(
-                    received_quantity,
+                    po_item.requested,
                     reason='Purchase order receipt',
                     reference=purchase_order.po_number,
                     user=request.user
                 )
 
-            except PurchaseOrderItem.DoesNotExist:
-                return Response(
-                    {'error': f'Purchase order item {item_data["id"]} not found'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-
-        # Update purchase order status
-        all_received = all(item.is_fully_received for item in purchase_order.items.all())
-        if all_received:
-            purchase_order.status = 'received'
-            purchase_order.actual_delivery_date = timezone.now().date()
-        else:
-            purchase_order.status = 'partially_received'
-        purchase_order.save()
+            # Update purchase order status
+            all_received = not purchase_order.items.filter(
+                quantity_received__lt=F('quantity_ordered')
+            ).exists()
+            if all_received:
+                purchase_order.status = 'received'
+                purchase_order.actual_delivery_date = timezone.now().date()
+            else:
+                purchase_order.status = 'partially_received'
+            purchase_order.save()
 
         return Response({'message': 'Items received successfully'})
 
@@ -301,11 +332,22 @@ class InventoryReportsViewSet(viewsets.ViewSet):
         low_stock_items = items.filter(current_stock__lte=F('reorder_point')).count()
         out_of_stock_items = items.filter(current_stock__lte=0).count()
 
-        # Items by category
-        items_by_category = items.values('category__name').annotate(
+        # Items by category - group on the indexed FK, then resolve names once
+        category_rows = list(items.values('category_id').annotate(
             count=Count('id'),
             value=Sum(F('current_stock') * F('unit_cost'))
-        ).order_by('-count')
+        ).order_by('-count'))
+        category_names = dict(InventoryCategory.objects.filter(
+            id__in=[row['category_id'] for row in category_rows]
+        ).values_list('id', 'name'))
+        items_by_category = [
+            {
+                'category__name': category_names.get(row['category_id']),
+                'count': row['count'],
+                'value': row['value'],
+            }
+            for row in category_rows
+        ]
 
         # Recent transactions
         recent_transactions = StockTransaction.objects.select_related(
@@ -328,7 +370,7 @@ class InventoryReportsViewSet(viewsets.ViewSet):
             'total_value': float(total_value),
             'low_stock_items': low_stock_items,
             'out_of_stock_items': out_of_stock_items,
-            'items_by_category': list(items_by_category),
+            'items_by_category': items_by_category,
             'recent_transactions': transactions_data,
             'generated_at': timezone.now().isoformat()
         }
@@ -339,6 +381,7 @@ class InventoryReportsViewSet(viewsets.ViewSet):
         return Response(serializer.validated_data)
 
     @action(detail=False, methods=['get'])
+    @transaction.atomic
     def stock_movement(self, request):
         """Get stock movement report"""
         start_date = request.query_params.get('start_date')
@@ -353,33 +396,36 @@ class InventoryReportsViewSet(viewsets.ViewSet):
         transactions = StockTransaction.objects.filter(
             created_at__date__gte=start_date,
             created_at__date__lte=end_date
-        ).select_related('item')
+        ).select_related('item').only(
+            'item__name', 'item__sku', 'transaction_type', 'quantity_change'
+        ).iterator(chunk_size=2000)
 
         # Group by item and transaction type
         movements = {}
-        for transaction in transactions:
-            item_key = transaction.item.name
+        for stock_transaction in transactions:
+            item_key = stock_transaction.item.name
             if item_key not in movements:
                 movements[item_key] = {
                     'item_name': item_key,
-                    'sku': transaction.item.sku,
-                    'purchases': 0,
-                    'sales': 0,
-                    'adjustments': 0,
-                    'returns': 0,
-                    'net_change': 0
+                    'sku': stock_transaction.item.sku,
+                    'purchases': Decimal('0'),
+                    'sales': Decimal('0'),
+                    'adjustments': Decimal('0'),
+                    'returns': Decimal('0'),
+                    'net_change': Decimal('0')
                 }
 
-            if transaction.transaction_type == 'purchase':
-                movements[item_key]['purchases'] += float(transaction.quantity_change)
-            elif transaction.transaction_type == 'sale':
-                movements[item_key]['sales'] += float(transaction.quantity_change)
-            elif transaction.transaction_type == 'adjustment':
-                movements[item_key]['adjustments'] += float(transaction.quantity_change)
-            elif transaction.transaction_type == 'return':
-                movements[item_key]['returns'] += float(transaction.quantity_change)
-
-            movements[item_key]['net_change'] += float(transaction.quantity_change)
+            quantity_change = stock_transaction.quantity_change
+            if stock_transaction.transaction_type == 'purchase':
+                movements[item_key]['purchases'] += quantity_change
+            elif stock_transaction.transaction_type == 'sale':
+                movements[item_key]['sales'] += quantity_change
+            elif stock_transaction.transaction_type == 'adjustment':
+                movements[item_key]['adjustments'] += quantity_change
+            elif stock_transaction.transaction_type == 'return':
+                movements[item_key]['returns'] += quantity_change
+
+            movements[item_key]['net_change'] += quantity_change
 
         return Response({
             'movements': list(movements.values()),
@@ -1,5 +1,16 @@
 from django.contrib import admin
-from .models import Job, JobPhoto, JobDocument, JobStatusUpdate
+from .models import Job, JobMaterial, JobPhoto, JobDocument, JobStatusUpdate
+
+
+class JobMaterialInline(admin.TabularInline):
+    """
+    Inline admin for JobMaterial.
+    """
+    model = JobMaterial
+    extra = 0
+    readonly_fields = ['created_at']
+    fields = ['inventory_item', 'quantity', 'created_at']
+    raw_id_fields = ['inventory_item']
 
 
 class JobPhotoInline(admin.TabularInline):
@@ -85,14 +96,24 @@ class JobAdmin(admin.ModelAdmin):
     )
 
     readonly_fields = ['job_number', 'created_at', 'updated_at']
-    inlines = [JobPhotoInline, JobDocumentInline, JobStatusUpdateInline]
+    inlines = [JobMaterialInline, JobPhotoInline, JobDocumentInline, JobStatusUpdateInline]
     filter_horizontal = ['assigned_technicians']
 
+    # Long text columns that the changelist never renders
+    changelist_deferred_fields = [
+        'description', 'special_instructions', 'customer_notes',
+        'internal_notes', 'customer_feedback'
+    ]
+
     def get_queryset(self, request):
         """Optimize queryset for admin"""
-        return super().get_queryset(request).select_related(
+        queryset = super().get_queryset(request).select_related(
             'customer', 'assigned_crew', 'created_by'
         )
+        changelist_url_name = f'{self.opts.app_label}_{self.opts.model_name}_changelist'
+        if request.resolver_match and request.resolver_match.url_name == changelist_url_name:
+            queryset = queryset.defer(*self.changelist_deferred_fields)
+        return queryset
 
 
 @admin.register(JobPhoto)
@@ -101,6 +122,7 @@ class JobPhotoAdmin(admin.ModelAdmin):
     Admin for JobPhoto model.
     """
     list_display = ['job', 'photo_type', 'caption', 'uploaded_by', 'uploaded_at']
+    list_select_related = ['job__customer', 'uploaded_by']
     list_filter = ['photo_type', 'uploaded_at', 'uploaded_by']
     search_fields = ['job__job_number', 'job__title', 'caption', 'uploaded_by__username']
     readonly_fields = ['uploaded_at']
@@ -125,6 +147,7 @@ class JobDocumentAdmin(admin.ModelAdmin):
     Admin for JobDocument model.
     """
     list_display = ['job', 'document_type', 'title', 'uploaded_by', 'uploaded_at']
+    list_select_related = ['job__customer', 'uploaded_by']
     list_filter = ['document_type', 'uploaded_at', 'uploaded_by']
     search_fields = ['job__job_number', 'job__title', 'title', 'uploaded_by__username']
     readonly_fields = ['uploaded_at']
@@ -145,6 +168,7 @@ class JobStatusUpdateAdmin(admin.ModelAdmin):
     Admin for JobStatusUpdate model.
     """
     list_display = ['job', 'old_status', 'new_status', 'updated_by', 'updated_at']
+    list_select_related = ['job__customer', 'updated_by']
     list_filter = ['old_status', 'new_status', 'updated_by', 'updated_at']
     search_fields = ['job__job_number', 'job__title', 'notes']
     readonly_fields = ['updated_at']
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.24 on 2026-10-16 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="JobDailySequence",
+            fields=[
+                (
+                    "date",
+                    models.DateField(
+                        help_text="Day the sequence belongs to",
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "last_seq",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="Last sequence number handed out for this day",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Job Daily Sequence",
+                "verbose_name_plural": "Job Daily Sequences",
+            },
+        ),
+    ]
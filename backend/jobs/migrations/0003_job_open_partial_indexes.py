@@ -0,0 +1,33 @@
+# Generated by Django 4.2.24 on 2026-10-16 09:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0002_jobdailysequence"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(
+                condition=models.Q(
+                    ("status__in", ["scheduled", "dispatched", "in_progress"])
+                ),
+                fields=["scheduled_date"],
+                name="jobs_open_sched_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(
+                condition=models.Q(
+                    ("status__in", ["scheduled", "dispatched", "in_progress"])
+                ),
+                fields=["assigned_crew", "scheduled_date"],
+                name="jobs_open_crew_sched_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.24 on 2026-10-16 10:05
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0003_job_open_partial_indexes"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="job",
+            name="jobs_job_job_num_b42e46_idx",
+        ),
+    ]
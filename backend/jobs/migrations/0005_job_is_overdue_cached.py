@@ -0,0 +1,34 @@
+# Generated by Django 4.2.24 on 2026-10-16 10:30
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def populate_is_overdue_cached(apps, schema_editor):
+    Job = apps.get_model("jobs", "Job")
+    Job.objects.filter(
+        status__in=["scheduled", "dispatched", "in_progress"],
+        scheduled_date__lt=timezone.now().date(),
+    ).update(is_overdue_cached=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0004_remove_job_jobs_job_job_num_b42e46_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="job",
+            name="is_overdue_cached",
+            field=models.BooleanField(
+                db_index=True,
+                default=False,
+                help_text="Stored copy of is_overdue, refreshed on save and nightly",
+            ),
+        ),
+        migrations.RunPython(
+            populate_is_overdue_cached, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.24 on 2026-10-16 11:02
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_reply_count_cached(apps, schema_editor):
+    JobNote = apps.get_model("jobs", "JobNote")
+    reply_counts = (
+        JobNote.objects.filter(parent_note__isnull=False)
+        .values("parent_note")
+        .annotate(count=Count("id"))
+    )
+    for row in reply_counts:
+        JobNote.objects.filter(pk=row["parent_note"]).update(
+            reply_count_cached=row["count"]
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0005_job_is_overdue_cached"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="jobnote",
+            name="reply_count_cached",
+            field=models.PositiveIntegerField(
+                default=0, help_text="Number of direct replies to this note"
+            ),
+        ),
+        migrations.RunPython(
+            populate_reply_count_cached, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 4.2.24 on 2026-10-16 11:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0006_jobnote_reply_count_cached"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="job",
+            name="latitude",
+            field=models.FloatField(
+                blank=True, help_text="GPS latitude for mapping", null=True
+            ),
+        ),
+        migrations.AlterField(
+            model_name="job",
+            name="longitude",
+            field=models.FloatField(
+                blank=True, help_text="GPS longitude for mapping", null=True
+            ),
+        ),
+        migrations.AlterField(
+            model_name="jobphoto",
+            name="latitude",
+            field=models.FloatField(
+                blank=True, help_text="GPS latitude where photo was taken", null=True
+            ),
+        ),
+        migrations.AlterField(
+            model_name="jobphoto",
+            name="longitude",
+            field=models.FloatField(
+                blank=True, help_text="GPS longitude where photo was taken", null=True
+            ),
+        ),
+        migrations.AlterField(
+            model_name="jobstatusupdate",
+            name="latitude",
+            field=models.FloatField(
+                blank=True, help_text="GPS latitude where status was updated", null=True
+            ),
+        ),
+        migrations.AlterField(
+            model_name="jobstatusupdate",
+            name="longitude",
+            field=models.FloatField(
+                blank=True, help_text="GPS longitude where status was updated", null=True
+            ),
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 4.2.24 on 2026-10-16 11:55
+
+from decimal import Decimal
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory", "0001_initial"),
+        ("jobs", "0007_coordinates_float"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="JobMaterial",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "quantity",
+                    models.DecimalField(
+                        decimal_places=2,
+                        help_text="Quantity required",
+                        max_digits=10,
+                        validators=[
+                            django.core.validators.MinValueValidator(Decimal("0.01"))
+                        ],
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "inventory_item",
+                    models.ForeignKey(
+                        help_text="Inventory item required",
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="job_materials",
+                        to="inventory.inventoryitem",
+                    ),
+                ),
+                (
+                    "job",
+                    models.ForeignKey(
+                        help_text="Job that requires this material",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="materials",
+                        to="jobs.job",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Job Material",
+                "verbose_name_plural": "Job Materials",
+                "ordering": ["id"],
+                "unique_together": {("job", "inventory_item")},
+            },
+        ),
+    ]
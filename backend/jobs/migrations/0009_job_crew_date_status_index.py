@@ -0,0 +1,20 @@
+# Generated by Django 4.2.24 on 2026-10-16 13:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0008_jobmaterial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(
+                fields=["assigned_crew", "scheduled_date", "status"],
+                name="jobs_crew_date_status_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.24 on 2026-10-16 13:40
+
+from django.db import migrations, models
+
+
+def populate_file_size_bytes(apps, schema_editor):
+    JobDocument = apps.get_model("jobs", "JobDocument")
+    for document in JobDocument.objects.exclude(document="").iterator():
+        try:
+            size = document.document.size
+        except (OSError, ValueError):
+            continue
+        JobDocument.objects.filter(pk=document.pk).update(file_size_bytes=size)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0009_job_crew_date_status_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="jobdocument",
+            name="file_size_bytes",
+            field=models.PositiveBigIntegerField(
+                blank=True,
+                editable=False,
+                help_text="Size of the document file in bytes",
+                null=True,
+            ),
+        ),
+        migrations.RunPython(populate_file_size_bytes, migrations.RunPython.noop),
+    ]
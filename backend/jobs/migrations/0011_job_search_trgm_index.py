@@ -0,0 +1,35 @@
+# Generated by Django 4.2.24 on 2026-10-16 14:05
+
+from django.db import migrations
+
+# Trigram GIN index so the job list search (icontains on job_number/title)
+# can use an index. PostgreSQL only; other backends skip it.
+CREATE_SQL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS jobs_search_trgm_idx ON jobs_job "
+    "USING gin (UPPER(job_number) gin_trgm_ops, UPPER(title) gin_trgm_ops)",
+]
+DROP_SQL = ["DROP INDEX IF EXISTS jobs_search_trgm_idx"]
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        for sql in CREATE_SQL:
+            schema_editor.execute(sql)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        for sql in DROP_SQL:
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0010_jobdocument_file_size_bytes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.24 on 2026-10-16 14:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0011_job_search_trgm_index"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="job",
+            name="jobs_open_sched_idx",
+        ),
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(
+                condition=models.Q(
+                    ("status__in", ["scheduled", "dispatched", "in_progress"])
+                ),
+                fields=["scheduled_date", "scheduled_time"],
+                name="jobs_open_sched_time_idx",
+            ),
+        ),
+    ]
@@ -1,8 +1,96 @@
-from django.db import models
+import datetime
+
+from django.db import models, transaction
+from django.db.models import Count, ExpressionWrapper, F, Q
 from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.core.validators import MinValueValidator
 from decimal import Decimal
+from types import MappingProxyType
+
+
+# Color codes used by the UI, keyed by job status / priority
+_STATUS_COLORS = MappingProxyType({
+    'new': 'gray',
+    'scheduled': 'blue',
+    'dispatched': 'purple',
+    'in_progress': 'yellow',
+    'completed': 'green',
+    'cancelled': 'red',
+    'on_hold': 'orange',
+})
+
+_PRIORITY_COLORS = MappingProxyType({
+    'low': 'green',
+    'medium': 'yellow',
+    'high': 'orange',
+    'urgent': 'red',
+})
+
+
+class JobDailySequence(models.Model):
+    """
+    Per-day counter used to allocate job numbers without scanning the jobs table.
+    """
+    date = models.DateField(
+        primary_key=True,
+        help_text='Day the sequence belongs to'
+    )
+
+    last_seq = models.PositiveIntegerField(
+        default=0,
+        help_text='Last sequence number handed out for this day'
+    )
+
+    class Meta:
+        verbose_name = 'Job Daily Sequence'
+        verbose_name_plural = 'Job Daily Sequences'
+
+    def __str__(self):
+        return f"{self.date}: {self.last_seq}"
+
+    @classmethod
+    def next_value(cls, date):
+        """
+        Atomically increment and return the sequence for a day.
+        The row lock taken by the UPDATE serializes concurrent callers
+        until the surrounding transaction commits.
+        """
+        with transaction.atomic():
+            cls.objects.get_or_create(
+                date=date,
+                defaults={'last_seq': lambda: cls._existing_job_count(date)}
+            )
+            cls.objects.filter(date=date).update(last_seq=F('last_seq') + 1)
+            return cls.objects.values_list('last_seq', flat=True).get(date=date)
+
+    @staticmethod
+    def _existing_job_count(date):
+        """Seed a new day with jobs numbered before the sequence existed"""
+        # Half-open range so the created_at index can be used
+        day_start = timezone.make_aware(datetime.datetime.combine(date, datetime.time.min))
+        return Job.objects.filter(
+            job_number__startswith=f"JOB-{date.strftime('%Y%m%d')}",
+            created_at__gte=day_start,
+            created_at__lt=day_start + datetime.timedelta(days=1)
+        ).count()
+
+
+class JobQuerySet(models.QuerySet):
+    """
+    QuerySet helpers for Job.
+    """
+
+    def with_durations(self):
+        """Annotate the actual duration (end - start) computed in SQL"""
+        return self.annotate(
+            actual_duration_db=ExpressionWrapper(
+                F('actual_end_time') - F('actual_start_time'),
+                output_field=models.DurationField()
+            )
+        )
 
 
 class Job(models.Model):
@@ -20,6 +108,9 @@ class Job(models.Model):
         ('on_hold', 'On Hold'),
     ]
 
+    # Statuses of jobs that are still on the schedule
+    OPEN_STATUSES = frozenset({'scheduled', 'dispatched', 'in_progress'})
+
     PRIORITY_CHOICES = [
         ('low', 'Low'),
         ('medium', 'Medium'),
@@ -142,17 +233,13 @@ class Job(models.Model):
         help_text='Job address (can be different from customer address)'
     )
 
-    latitude = models.DecimalField(
-        max_digits=9,
-        decimal_places=6,
+    latitude = models.FloatField(
         null=True,
         blank=True,
         help_text='GPS latitude for mapping'
     )
 
-    longitude = models.DecimalField(
-        max_digits=9,
-        decimal_places=6,
+    longitude = models.FloatField(
         null=True,
         blank=True,
         help_text='GPS longitude for mapping'
@@ -217,6 +304,13 @@ class Job(models.Model):
         help_text='Customer feedback after job completion'
     )
 
+    # Denormalized overdue flag for indexed filtering
+    is_overdue_cached = models.BooleanField(
+        default=False,
+        db_index=True,
+        help_text='Stored copy of is_overdue, refreshed on save and nightly'
+    )
+
     # Metadata
     created_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -229,6 +323,13 @@ class Job(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = JobQuerySet.as_manager()
+
+    CACHE_VERSION_KEY = 'jobs:version'
+
+    # Status as loaded from the database; None for unsaved jobs
+    _original_status = None
+
     class Meta:
         ordering = ['-scheduled_date', '-created_at']
         verbose_name = 'Job'
@@ -237,46 +338,89 @@ class Job(models.Model):
             models.Index(fields=['customer', 'status']),
             models.Index(fields=['scheduled_date', 'status']),
             models.Index(fields=['assigned_crew', 'status']),
-            models.Index(fields=['job_number']),
+            # Crew/date conflict checks in JobCreateSerializer/JobUpdateSerializer
+            models.Index(fields=['assigned_crew', 'scheduled_date', 'status'], name='jobs_crew_date_status_idx'),
             models.Index(fields=['created_at']),
             models.Index(fields=['status', 'priority']),
+            # Partial indexes covering only open jobs (overdue / day schedule views,
+            # and date + time-range reminder windows)
+            models.Index(
+                fields=['scheduled_date', 'scheduled_time'],
+                name='jobs_open_sched_time_idx',
+                condition=Q(status__in=['scheduled', 'dispatched', 'in_progress'])
+            ),
+            models.Index(
+                fields=['assigned_crew', 'scheduled_date'],
+                name='jobs_open_crew_sched_idx',
+                condition=Q(status__in=['scheduled', 'dispatched', 'in_progress'])
+            ),
         ]
 
     def __str__(self):
         return f"{self.job_number or 'No Number'} - {self.customer.get_full_name()} - {self.title}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the loaded status so jobs.signals can detect status changes
+        instance._original_status = instance.__dict__.get('status')
+        return instance
+
+    @classmethod
+    def get_cache_version(cls):
+        """Current version for cached job list results"""
+        return cache.get_or_set(cls.CACHE_VERSION_KEY, 1, None)
+
+    @classmethod
+    def bump_cache_version(cls):
+        """Invalidate cached job list results (called from jobs.signals)"""
+        if not cache.add(cls.CACHE_VERSION_KEY, 1, None):
+            try:
+                cache.incr(cls.CACHE_VERSION_KEY)
+            except ValueError:
+                cache.set(cls.CACHE_VERSION_KEY, 1, None)
+
     def save(self, *args, **kwargs):
+        # Keep the stored overdue flag in step with status/schedule changes
+        self.is_overdue_cached = self.is_overdue
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'status', 'scheduled_date'} & set(update_fields):
+            kwargs['update_fields'] = set(update_fields) | {'is_overdue_cached'}
+
         # Auto-generate job number if not set
         if not self.job_number:
             # Generate job number like JOB-20241215-001
-            import datetime
             today = datetime.date.today()
             date_str = today.strftime('%Y%m%d')
 
-            # Find the next number for today
-            today_jobs = Job.objects.filter(
-                job_number__startswith=f'JOB-{date_str}',
-                created_at__date=today
-            ).count()
-
-            self.job_number = f'JOB-{date_str}-{str(today_jobs + 1).zfill(3)}'
+            with transaction.atomic():
+                # Allocate the next number for today in the same transaction as the insert
+                sequence = JobDailySequence.next_value(today)
+                self.job_number = f'JOB-{date_str}-{str(sequence).zfill(3)}'
+                super().save(*args, **kwargs)
+        else:
+            super().save(*args, **kwargs)
 
-        super().save(*args, **kwargs)
+        # post_save handlers have run; later saves compare against this status
+        self._original_status = self.status
 
     @property
     def is_overdue(self):
         """Check if scheduled job is overdue"""
-        if self.scheduled_date and self.status in ['scheduled', 'dispatched', 'in_progress']:
-            from django.utils import timezone
+        if self.scheduled_date and self.status in self.OPEN_STATUSES:
             return self.scheduled_date < timezone.now().date()
         return False
 
     @property
     def duration_display(self):
         """Display estimated duration in a readable format"""
-        if self.estimated_duration_hours:
-            hours = int(self.estimated_duration_hours)
-            minutes = int((self.estimated_duration_hours - hours) * 60)
+        return self.format_duration(self.estimated_duration_hours)
+
+    @staticmethod
+    def format_duration(duration_hours):
+        """Format a duration in hours as e.g. '2h 30m'"""
+        if duration_hours:
+            hours, minutes = divmod(int(duration_hours * 60), 60)
             if minutes > 0:
                 return f"{hours}h {minutes}m"
             return f"{hours}h"
@@ -285,6 +429,11 @@ class Job(models.Model):
     @property
     def actual_duration(self):
         """Calculate actual job duration if completed"""
+        # Prefer the value annotated by JobQuerySet.with_durations()
+        if hasattr(self, 'actual_duration_db'):
+            if self.actual_duration_db is None:
+                return None
+            return self.actual_duration_db.total_seconds() / 3600
         if self.actual_start_time and self.actual_end_time:
             duration = self.actual_end_time - self.actual_start_time
             return duration.total_seconds() / 3600  # Convert to hours
@@ -292,33 +441,36 @@ class Job(models.Model):
 
     def get_status_color(self):
         """Get color code for job status (for UI)"""
-        colors = {
-            'new': 'gray',
-            'scheduled': 'blue',
-            'dispatched': 'purple',
-            'in_progress': 'yellow',
-            'completed': 'green',
-            'cancelled': 'red',
-            'on_hold': 'orange',
-        }
-        return colors.get(self.status, 'gray')
+        return _STATUS_COLORS.get(self.status, 'gray')
 
     def get_priority_color(self):
         """Get color code for job priority"""
-        colors = {
-            'low': 'green',
-            'medium': 'yellow',
-            'high': 'orange',
-            'urgent': 'red',
-        }
-        return colors.get(self.priority, 'gray')
+        return _PRIORITY_COLORS.get(self.priority, 'gray')
+
+    @classmethod
+    def filter_assignable_crews(cls, crews):
+        """
+        Annotate a Crew queryset with its active job count and keep only
+        crews with spare capacity, in a single query.
+        """
+        return crews.annotate(
+            active_job_count=Count(
+                'assigned_jobs',
+                filter=Q(assigned_jobs__status__in=cls.OPEN_STATUSES)
+            )
+        ).filter(max_concurrent_jobs__gt=F('active_job_count'))
 
     def can_be_assigned_to_crew(self, crew):
         """Check if this job can be assigned to a crew"""
         # Check if crew has capacity
-        if crew.max_concurrent_jobs <= crew.assigned_jobs.filter(
-            status__in=['scheduled', 'dispatched', 'in_progress']
-        ).count():
+        active_job_count = getattr(crew, 'active_job_count', None)
+        if active_job_count is not None:
+            has_capacity = crew.max_concurrent_jobs > active_job_count
+        else:
+            has_capacity = self.filter_assignable_crews(
+                crew._meta.model.objects.filter(pk=crew.pk)
+            ).exists()
+        if not has_capacity:
             return False
 
         # Check if crew has required skills (basic check)
@@ -328,6 +480,61 @@ class Job(models.Model):
 
         return True
 
+    def set_materials(self, materials):
+        """
+        Replace this job's JobMaterial rows in one DELETE and one bulk INSERT.
+        `materials` is an iterable of dicts with `inventory_item` (id) and `quantity`.
+        """
+        rows = [
+            JobMaterial(
+                job=self,
+                inventory_item_id=material['inventory_item'],
+                quantity=material['quantity']
+            )
+            for material in materials
+        ]
+        with transaction.atomic():
+            self.materials.all().delete()
+            JobMaterial.objects.bulk_create(rows)
+        return rows
+
+
+class JobMaterial(models.Model):
+    """
+    Inventory items required for a job, one row per item.
+    """
+    job = models.ForeignKey(
+        Job,
+        on_delete=models.CASCADE,
+        related_name='materials',
+        help_text='Job that requires this material'
+    )
+
+    inventory_item = models.ForeignKey(
+        'inventory.InventoryItem',
+        on_delete=models.PROTECT,
+        related_name='job_materials',
+        help_text='Inventory item required'
+    )
+
+    quantity = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        validators=[MinValueValidator(Decimal('0.01'))],
+        help_text='Quantity required'
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ['job', 'inventory_item']
+        ordering = ['id']
+        verbose_name = 'Job Material'
+        verbose_name_plural = 'Job Materials'
+
+    def __str__(self):
+        return f"{self.job.job_number} - {self.inventory_item.name} x {self.quantity}"
+
 
 class JobPhoto(models.Model):
     """
@@ -377,17 +584,13 @@ class JobPhoto(models.Model):
     uploaded_at = models.DateTimeField(auto_now_add=True)
 
     # Location data if photo was taken on site
-    latitude = models.DecimalField(
-        max_digits=9,
-        decimal_places=6,
+    latitude = models.FloatField(
         null=True,
         blank=True,
         help_text='GPS latitude where photo was taken'
     )
 
-    longitude = models.DecimalField(
-        max_digits=9,
-        decimal_places=6,
+    longitude = models.FloatField(
         null=True,
         blank=True,
         help_text='GPS longitude where photo was taken'
@@ -452,6 +655,14 @@ class JobDocument(models.Model):
         help_text='User who uploaded this document'
     )
 
+    # Stored on save so listing documents never stats the storage backend
+    file_size_bytes = models.PositiveBigIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text='Size of the document file in bytes'
+    )
+
     uploaded_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -462,6 +673,15 @@ class JobDocument(models.Model):
     def __str__(self):
         return f"{self.job.job_number} - {self.title}"
 
+    def save(self, *args, **kwargs):
+        # Record the size on upload (or when a new file replaces the old one)
+        if self.document and (self.file_size_bytes is None or not self.document._committed):
+            try:
+                self.file_size_bytes = self.document.size
+            except (OSError, ValueError):
+                self.file_size_bytes = None
+        super().save(*args, **kwargs)
+
 
 class JobStatusUpdate(models.Model):
     """
@@ -502,17 +722,13 @@ class JobStatusUpdate(models.Model):
     updated_at = models.DateTimeField(auto_now_add=True)
 
     # Location data if status was updated on site
-    latitude = models.DecimalField(
-        max_digits=9,
-        decimal_places=6,
+    latitude = models.FloatField(
         null=True,
         blank=True,
         help_text='GPS latitude where status was updated'
     )
 
-    longitude = models.DecimalField(
-        max_digits=9,
-        decimal_places=6,
+    longitude = models.FloatField(
         null=True,
         blank=True,
         help_text='GPS longitude where status was updated'
@@ -616,6 +832,12 @@ class JobNote(models.Model):
         help_text='Whether this note is pinned to the top'
     )
 
+    # Denormalized reply counter maintained by jobs.signals
+    reply_count_cached = models.PositiveIntegerField(
+        default=0,
+        help_text='Number of direct replies to this note'
+    )
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -633,15 +855,22 @@ class JobNote(models.Model):
     def __str__(self):
         return f"{self.job.job_number} - {self.get_note_type_display()} by {self.created_by.get_full_name() if self.created_by else 'Unknown'}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the loaded parent so re-parenting can adjust reply counters
+        instance._loaded_parent_note_id = instance.__dict__.get('parent_note_id')
+        return instance
+
     @property
     def has_replies(self):
         """Check if this note has replies"""
-        return self.replies.exists()
+        return self.reply_count_cached > 0
 
     @property
     def reply_count(self):
         """Get the number of replies"""
-        return self.replies.count()
+        return self.reply_count_cached
 
     @property
     def is_reply(self):
@@ -650,25 +879,50 @@ class JobNote(models.Model):
 
     def mark_as_read(self, user):
         """Mark this note as read by a user"""
-        self.read_by.add(user)
+        self.mark_many_read([self.pk], user)
+
+    @classmethod
+    def mark_many_read(cls, note_ids, user):
+        """
+        Mark several notes as read by a user with one INSERT that skips
+        rows which already exist.
+        """
+        ReadBy = cls.read_by.through
+        ReadBy.objects.bulk_create(
+            [ReadBy(jobnote_id=note_id, user_id=user.pk) for note_id in note_ids],
+            ignore_conflicts=True
+        )
 
     def is_read_by(self, user):
         """Check if this note has been read by a user"""
+        # Use prefetch_related('read_by') results when available
+        if 'read_by' in getattr(self, '_prefetched_objects_cache', {}):
+            return any(reader.id == user.id for reader in self.read_by.all())
         return self.read_by.filter(id=user.id).exists()
 
     def get_thread_notes(self):
         """Get all notes in this thread (including replies)"""
-        if self.is_reply:
-            # This is a reply, get the root note's thread
-            root_note = self.parent_note
-            while root_note.is_reply:
-                root_note = root_note.parent_note
-            return root_note.get_thread_notes()
-
-        # This is the root note, get all replies
-        thread_notes = [self]
-        for reply in self.replies.all():
-            thread_notes.extend(reply.get_thread_notes())
+        # Load the job's notes once and assemble the thread in memory
+        notes_by_id = {note.id: note for note in JobNote.objects.filter(job_id=self.job_id)}
+        notes_by_id[self.id] = self
+
+        replies_by_parent = {}
+        for note in notes_by_id.values():
+            if note.parent_note_id is not None:
+                replies_by_parent.setdefault(note.parent_note_id, []).append(note)
+
+        # This may be a reply, walk up to the root note
+        root_note = self
+        while root_note.parent_note_id in notes_by_id:
+            root_note = notes_by_id[root_note.parent_note_id]
+
+        # Depth-first, replies in default ordering
+        thread_notes = []
+        stack = [root_note]
+        while stack:
+            note = stack.pop()
+            thread_notes.append(note)
+            stack.extend(reversed(replies_by_parent.get(note.id, [])))
         return thread_notes
 
 
@@ -690,6 +944,10 @@ class JobHistory(models.Model):
         ('notification_sent', 'Notification Sent'),
     ]
 
+    FIELD_CHANGE_TYPES = frozenset({'updated', 'status_changed', 'assigned'})
+    ASSET_CHANGE_TYPES = frozenset({'photo_added', 'photo_removed', 'document_added', 'document_removed'})
+    COMMUNICATION_TYPES = frozenset({'note_added', 'notification_sent'})
+
     job = models.ForeignKey(
         Job,
         on_delete=models.CASCADE,
@@ -790,17 +1048,31 @@ class JobHistory(models.Model):
     def __str__(self):
         return f"{self.job.job_number} - {self.get_history_type_display()} at {self.created_at}"
 
+    @classmethod
+    def log_batch(cls, entries, batch_size=500):
+        """
+        Record several history entries with multi-row INSERTs.
+        Rows are written once the surrounding transaction commits
+        (immediately when called outside a transaction).
+        """
+        history = [cls(**entry) for entry in entries]
+        if history:
+            transaction.on_commit(
+                lambda: cls.objects.bulk_create(history, batch_size=batch_size)
+            )
+        return history
+
     @property
     def is_field_change(self):
         """Check if this is a field value change"""
-        return self.history_type in ['updated', 'status_changed', 'assigned']
+        return self.history_type in self.FIELD_CHANGE_TYPES
 
     @property
     def is_asset_change(self):
         """Check if this is an asset (photo/document) change"""
-        return self.history_type in ['photo_added', 'photo_removed', 'document_added', 'document_removed']
+        return self.history_type in self.ASSET_CHANGE_TYPES
 
     @property
     def is_communication(self):
         """Check if this is a communication-related change"""
-        return self.history_type in ['note_added', 'notification_sent']
+        return self.history_type in self.COMMUNICATION_TYPES
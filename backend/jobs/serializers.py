@@ -1,3 +1,5 @@
+import copy
+
 from rest_framework import serializers
 from django.utils import timezone
 from .models import Job, JobPhoto, JobDocument, JobStatusUpdate
@@ -5,7 +7,69 @@ from customers.serializers import CustomerListSerializer
 from technicians.serializers import CrewSerializer, TechnicianProfileSerializer
 
 
-class JobPhotoSerializer(serializers.ModelSerializer):
+def _crew_has_open_job(crew, scheduled_date, exclude_pk=None):
+    """Check whether a crew already has an open job on a date"""
+    return Job.objects.filter(
+        assigned_crew_id=crew.pk,
+        scheduled_date=scheduled_date,
+        status__in=Job.OPEN_STATUSES
+    ).exclude(pk=exclude_pk).exists()
+
+
+class CachedFieldsSerializerMixin:
+    """
+    Build a serializer's field declarations once per class and hand each
+    instance deep copies, skipping the model introspection on every
+    instantiation. Deep copies (as Serializer.get_fields makes of declared
+    fields) keep nested serializers and relation children per instance.
+    """
+    _fields_cache = {}
+
+    def get_fields(self):
+        cls = self.__class__
+        if cls not in CachedFieldsSerializerMixin._fields_cache:
+            CachedFieldsSerializerMixin._fields_cache[cls] = super().get_fields()
+        return copy.deepcopy(CachedFieldsSerializerMixin._fields_cache[cls])
+
+
+class AbsoluteURLMixin:
+    """
+    Build absolute file URLs from a scheme/host prefix resolved once per
+    serializer; a many=True list reuses one child serializer for every row.
+    """
+
+    def absolute_url(self, url):
+        if not hasattr(self, '_base_url'):
+            request = self.context.get('request')
+            self._base_url = request.build_absolute_uri('/')[:-1] if request else None
+        # Storage URLs that are already absolute (e.g. S3) pass through unchanged
+        if self._base_url and url.startswith('/'):
+            return self._base_url + url
+        return url
+
+
+class SparseFieldsMixin:
+    """
+    Limit the rendered fields to a comma-separated ?fields= query parameter.
+    """
+
+    @staticmethod
+    def get_requested_fields(request):
+        """Return the requested field names, or None when not restricted"""
+        fields = request.query_params.get('fields') if request else None
+        if not fields:
+            return None
+        return {name.strip() for name in fields.split(',') if name.strip()}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        requested = self.get_requested_fields(self.context.get('request'))
+        if requested is not None:
+            for field_name in set(self.fields) - requested:
+                self.fields.pop(field_name)
+
+
+class JobPhotoSerializer(AbsoluteURLMixin, CachedFieldsSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for JobPhoto model.
     """
@@ -24,14 +88,11 @@ class JobPhotoSerializer(serializers.ModelSerializer):
     def get_image_url(self, obj):
         """Get the full URL for the image"""
         if obj.image:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.image.url)
-            return obj.image.url
+            return self.absolute_url(obj.image.url)
         return None
 
 
-class JobDocumentSerializer(serializers.ModelSerializer):
+class JobDocumentSerializer(AbsoluteURLMixin, CachedFieldsSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for JobDocument model.
     """
@@ -50,25 +111,22 @@ class JobDocumentSerializer(serializers.ModelSerializer):
     def get_document_url(self, obj):
         """Get the full URL for the document"""
         if obj.document:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.document.url)
-            return obj.document.url
+            return self.absolute_url(obj.document.url)
         return None
 
     def get_file_size(self, obj):
         """Get human-readable file size"""
-        if obj.document and obj.document.size:
-            size = obj.document.size
+        if obj.file_size_bytes is not None:
+            size = float(obj.file_size_bytes)
             for unit in ['B', 'KB', 'MB', 'GB']:
                 if size < 1024.0:
-                    return ".1f"
+                    return f"{size:.1f} {unit}"
                 size /= 1024.0
-            return ".1f"
+            return f"{size:.1f} TB"
         return "Unknown"
 
 
-class JobStatusUpdateSerializer(serializers.ModelSerializer):
+class JobStatusUpdateSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for JobStatusUpdate model.
     """
@@ -84,7 +142,7 @@ class JobStatusUpdateSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'updated_by', 'updated_at']
 
 
-class JobListSerializer(serializers.ModelSerializer):
+class JobListSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     """
     Lightweight serializer for job lists and calendar views.
     """
@@ -114,7 +172,7 @@ class JobListSerializer(serializers.ModelSerializer):
         return obj.get_priority_color()
 
 
-class JobDetailSerializer(serializers.ModelSerializer):
+class JobDetailSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Detailed serializer for individual job view.
     """
@@ -184,13 +242,7 @@ class JobCreateSerializer(serializers.ModelSerializer):
 
         if assigned_crew and scheduled_date:
             # Check if crew already has jobs on this date
-            existing_jobs = Job.objects.filter(
-                assigned_crew=assigned_crew,
-                scheduled_date=scheduled_date,
-                status__in=['scheduled', 'dispatched', 'in_progress']
-            ).exclude(pk=getattr(self.instance, 'pk', None))
-
-            if existing_jobs.exists():
+            if _crew_has_open_job(assigned_crew, scheduled_date, exclude_pk=getattr(self.instance, 'pk', None)):
                 raise serializers.ValidationError({
                     'assigned_crew': f'Crew "{assigned_crew.name}" is already assigned to jobs on {scheduled_date}.'
                 })
@@ -238,18 +290,16 @@ class JobUpdateSerializer(serializers.ModelSerializer):
     def validate(self, data):
         """Validate job data and check for conflicts"""
         instance = self.instance
+        # Crew and date unchanged, nothing new to conflict with
+        if instance and 'assigned_crew' not in data and 'scheduled_date' not in data:
+            return data
+
         assigned_crew = data.get('assigned_crew', instance.assigned_crew if instance else None)
         scheduled_date = data.get('scheduled_date', instance.scheduled_date if instance else None)
 
         if assigned_crew and scheduled_date:
             # Check if crew already has jobs on this date
-            existing_jobs = Job.objects.filter(
-                assigned_crew=assigned_crew,
-                scheduled_date=scheduled_date,
-                status__in=['scheduled', 'dispatched', 'in_progress']
-            ).exclude(pk=instance.pk if instance else None)
-
-            if existing_jobs.exists():
+            if _crew_has_open_job(assigned_crew, scheduled_date, exclude_pk=instance.pk if instance else None):
                 raise serializers.ValidationError({
                     'assigned_crew': f'Crew "{assigned_crew.name}" is already assigned to jobs on {scheduled_date}.'
                 })
@@ -257,7 +307,7 @@ class JobUpdateSerializer(serializers.ModelSerializer):
         return data
 
 
-class JobCalendarSerializer(serializers.ModelSerializer):
+class JobCalendarSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     """
     Lightweight serializer for calendar views.
     """
@@ -1,9 +1,12 @@
+from collections import defaultdict
+
 from rest_framework import serializers
 from .models import JobNote, JobHistory
+from .serializers import AbsoluteURLMixin
 from accounts.serializers import UserSerializer
 
 
-class JobNoteSerializer(serializers.ModelSerializer):
+class JobNoteSerializer(AbsoluteURLMixin, serializers.ModelSerializer):
     """Serializer for job notes and chat messages"""
 
     created_by_name = serializers.CharField(source='created_by.get_full_name', read_only=True)
@@ -28,10 +31,7 @@ class JobNoteSerializer(serializers.ModelSerializer):
     def get_attachment_url(self, obj):
         """Get the full URL for the attachment"""
         if obj.attachment:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.attachment.url)
-            return obj.attachment.url
+            return self.absolute_url(obj.attachment.url)
         return None
 
     def create(self, validated_data):
@@ -51,7 +51,7 @@ class JobNoteCreateSerializer(serializers.ModelSerializer):
         ]
 
 
-class JobNoteThreadSerializer(serializers.ModelSerializer):
+class JobNoteThreadSerializer(AbsoluteURLMixin, serializers.ModelSerializer):
     """Serializer for job note threads (with replies)"""
 
     created_by_name = serializers.CharField(source='created_by.get_full_name', read_only=True)
@@ -69,17 +69,31 @@ class JobNoteThreadSerializer(serializers.ModelSerializer):
 
     def get_replies(self, obj):
         """Get all replies for this note"""
-        if obj.replies.exists():
-            return JobNoteThreadSerializer(obj.replies.all(), many=True, context=self.context).data
+        replies = self._get_replies_by_parent(obj.job_id).get(obj.id, [])
+        if replies:
+            return JobNoteThreadSerializer(replies, many=True, context=self.context).data
         return []
 
+    def _get_replies_by_parent(self, job_id):
+        """
+        Load a job's notes once per serialization and group them by parent,
+        shared with nested reply serializers through the context.
+        """
+        replies_by_job = self.context.setdefault('_replies_by_job', {})
+        if job_id not in replies_by_job:
+            replies_by_parent = defaultdict(list)
+            notes = JobNote.objects.filter(
+                job_id=job_id, parent_note__isnull=False
+            ).select_related('created_by')
+            for note in notes:
+                replies_by_parent[note.parent_note_id].append(note)
+            replies_by_job[job_id] = replies_by_parent
+        return replies_by_job[job_id]
+
     def get_attachment_url(self, obj):
         """Get the full URL for the attachment"""
         if obj.attachment:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.attachment.url)
-            return obj.attachment.url
+            return self.absolute_url(obj.attachment.url)
         return None
 
 
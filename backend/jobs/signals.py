@@ -1,119 +1,91 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import pre_save, post_save, post_delete, m2m_changed
 from django.dispatch import receiver
 from django.utils import timezone
-from .models import Job
+from .models import Job, JobNote
 
 
 @receiver(post_save, sender=Job)
 def send_job_notifications(sender, instance, created, **kwargs):
     """
-    Send notifications when jobs are created or updated.
+    Queue notifications when jobs are created or change status.
     """
-    if created:
-        # Send job created notifications
-        _send_job_created_notifications(instance)
-    else:
-        # Check if status changed
-        if instance.status != instance._original_status:
-            _send_job_status_notifications(instance)
+    from notifications.tasks import dispatch_job_notifications
+
+    old_status = instance._original_status
+    # Check if status changed since the job was loaded (see Job.from_db)
+    if not created and (old_status is None or instance.status == old_status):
+        return
+
+    job_id, new_status = instance.pk, instance.status
+    # Enqueue after commit so the worker sees the saved job; robust so a broker
+    # outage is logged instead of failing a save that already committed
+    transaction.on_commit(
+        lambda: dispatch_job_notifications.delay(job_id, created, old_status, new_status),
+        robust=True
+    )
 
 
-def _send_job_created_notifications(job):
+@receiver(pre_save, sender=JobNote)
+def remember_stored_parent_note(sender, instance, **kwargs):
     """
-    Send notifications when a job is created.
+    Look up the stored parent of a note that was not loaded from the database
+    (e.g. built in memory with an existing pk), so saving it is not counted
+    as a new reply.
     """
-    from notifications.models import NotificationTemplate
-    from notifications.services import notification_service
+    if instance._state.adding and instance.pk is not None:
+        instance._loaded_parent_note_id = JobNote.objects.filter(pk=instance.pk).values_list(
+            'parent_note_id', flat=True
+        ).first()
 
-    templates = NotificationTemplate.objects.filter(
-        trigger_on_job_create=True,
-        is_active=True
-    )
 
-    for template in templates:
-        try:
-            notification_service.send_notification(
-                template.template_type,
-                template.notification_method,
-                recipient_phone=job.customer.phone_number if template.send_to_customer else None,
-                recipient_email=job.customer.email if template.send_to_customer and template.notification_method == 'email' else None,
-                job=job,
-                customer=job.customer
-            )
-        except Exception as e:
-            # Log error but don't break the job save
-            print(f"Failed to send job created notification: {e}")
-
-
-def _send_job_status_notifications(job):
+@receiver(post_save, sender=JobNote)
+def update_reply_count_on_save(sender, instance, created, **kwargs):
     """
-    Send notifications when job status changes.
+    Keep the parent note's reply counter in step with new or re-parented replies.
     """
-    from notifications.models import NotificationTemplate
-    from notifications.services import notification_service
+    old_parent_id = None if created else getattr(instance, '_loaded_parent_note_id', None)
+    new_parent_id = instance.parent_note_id
+
+    if old_parent_id == new_parent_id:
+        return
+
+    if old_parent_id is not None:
+        JobNote.objects.filter(pk=old_parent_id).update(
+            reply_count_cached=F('reply_count_cached') - 1
+        )
+    if new_parent_id is not None:
+        JobNote.objects.filter(pk=new_parent_id).update(
+            reply_count_cached=F('reply_count_cached') + 1
+        )
+    instance._loaded_parent_note_id = new_parent_id
+
+
+@receiver(post_delete, sender=JobNote)
+def update_reply_count_on_delete(sender, instance, **kwargs):
+    """
+    Decrement the parent note's reply counter when a reply is deleted.
+    """
+    if instance.parent_note_id is not None:
+        JobNote.objects.filter(pk=instance.parent_note_id).update(
+            reply_count_cached=F('reply_count_cached') - 1
+        )
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def invalidate_job_list_cache(sender, instance, **kwargs):
+    """
+    Invalidate cached job list results when a job changes.
+    """
+    Job.bump_cache_version()
 
-    templates = NotificationTemplate.objects.filter(
-        trigger_on_status_change=True,
-        is_active=True
-    )
 
-    for template in templates:
-        # Check if this status should trigger the notification
-        trigger_statuses = template.trigger_statuses or []
-        if job.status not in trigger_statuses:
-            continue
-
-        try:
-            # Customer notifications
-            if template.send_to_customer and job.customer:
-                notification_service.send_notification(
-                    template.template_type,
-                    template.notification_method,
-                    recipient_phone=job.customer.phone_number if template.notification_method == 'sms' else None,
-                    recipient_email=job.customer.email if template.notification_method == 'email' else None,
-                    job=job,
-                    customer=job.customer,
-                    context_data={
-                        'old_status': job._original_status,
-                        'new_status': job.status
-                    }
-                )
-
-            # Technician notifications
-            if template.send_to_technician:
-                for technician in job.assigned_technicians.all():
-                    notification_service.send_notification(
-                        template.template_type,
-                        template.notification_method,
-                        recipient_phone=technician.user.phone_number if template.notification_method == 'sms' else None,
-                        recipient_email=technician.user.email if template.notification_method == 'email' else None,
-                        job=job,
-                        technician=technician,
-                        context_data={
-                            'old_status': job._original_status,
-                            'new_status': job.status
-                        }
-                    )
-
-        except Exception as e:
-            # Log error but don't break the job save
-            print(f"Failed to send job status notification: {e}")
-
-
-def _track_original_status(sender, instance, **kwargs):
+@receiver(m2m_changed, sender=Job.assigned_technicians.through)
+def invalidate_job_list_cache_on_assignment(sender, instance, action, **kwargs):
     """
-    Track the original status before save for comparison.
+    Invalidate cached job list results when technician assignments change.
     """
-    if instance.pk:
-        try:
-            original = Job.objects.get(pk=instance.pk)
-            instance._original_status = original.status
-        except Job.DoesNotExist:
-            instance._original_status = instance.status
-    else:
-        instance._original_status = instance.status
-
-
-# Connect the signal to track original status
-from django.db.models.signals import pre_save
-pre_save.connect(_track_original_status, sender=Job)
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        Job.bump_cache_version()
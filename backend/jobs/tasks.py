@@ -0,0 +1,27 @@
+import logging
+from celery import shared_task
+from django.utils import timezone
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def refresh_overdue_jobs():
+    """
+    Refresh the stored is_overdue_cached flag once the date rolls over.
+    """
+    today = timezone.now().date()
+    flagged = Job.objects.filter(
+        is_overdue_cached=False,
+        status__in=Job.OPEN_STATUSES,
+        scheduled_date__lt=today
+    ).update(is_overdue_cached=True)
+
+    cleared = Job.objects.filter(is_overdue_cached=True).exclude(
+        status__in=Job.OPEN_STATUSES,
+        scheduled_date__lt=today
+    ).update(is_overdue_cached=False)
+
+    logger.info(f"Overdue flags refreshed: {flagged} flagged, {cleared} cleared")
+    return {'flagged': flagged, 'cleared': cleared}
@@ -1,3 +1,435 @@
-from django.test import TestCase
+import datetime
+import json
+from decimal import Decimal
 
-# Create your tests here.
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from customers.models import Customer
+from inventory.models import InventoryItem
+from technicians.models import Crew
+from .models import Job, JobDailySequence, JobDocument, JobHistory, JobNote
+from .serializers import (
+    CachedFieldsSerializerMixin,
+    JobCalendarSerializer,
+    JobDetailSerializer,
+    JobDocumentSerializer,
+    JobListSerializer,
+    JobPhotoSerializer,
+    JobStatusUpdateSerializer
+)
+from .serializers_v11 import JobNoteThreadSerializer
+from .tasks import refresh_overdue_jobs
+from .views import (
+    JobCalendarView,
+    JobCursorPagination,
+    JobListCreateView,
+    job_calendar_etag,
+    job_detail_etag
+)
+
+
+def api_request(path):
+    """Build a DRF request for a GET to the given path"""
+    return Request(APIRequestFactory().get(path))
+
+
+class CustomerTestCase(TestCase):
+    """Base test case with a shared customer"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.customer = Customer.objects.create(
+            first_name='John',
+            last_name='Doe',
+            email='john@example.com'
+        )
+
+
+class JobTestCase(CustomerTestCase):
+    """Base test case with a shared customer and job"""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.job = Job.objects.create(customer=cls.customer, title='Test Job')
+
+
+class JobNumberTestCase(CustomerTestCase):
+    """Test cases for job number generation"""
+
+    def test_job_numbers_are_sequential_per_day(self):
+        """Test job numbers come from the daily sequence"""
+        date_str = datetime.date.today().strftime('%Y%m%d')
+
+        first = Job.objects.create(customer=self.customer, title='First Job')
+        second = Job.objects.create(customer=self.customer, title='Second Job')
+
+        self.assertEqual(first.job_number, f'JOB-{date_str}-001')
+        self.assertEqual(second.job_number, f'JOB-{date_str}-002')
+        self.assertEqual(
+            JobDailySequence.objects.get(date=datetime.date.today()).last_seq, 2
+        )
+
+    def test_explicit_job_number_is_kept(self):
+        """Test a provided job number does not consume the sequence"""
+        job = Job.objects.create(customer=self.customer, title='Manual', job_number='MANUAL-1')
+
+        self.assertEqual(job.job_number, 'MANUAL-1')
+        self.assertFalse(JobDailySequence.objects.exists())
+
+
+class JobOriginalStatusTestCase(CustomerTestCase):
+    """Test cases for tracking the loaded job status"""
+
+    def test_original_status_follows_load_and_save(self):
+        """Test _original_status is captured on load and refreshed on save"""
+        job = Job.objects.create(customer=self.customer, title='Status Job')
+        self.assertEqual(job._original_status, 'new')
+
+        job = Job.objects.get(pk=job.pk)
+        self.assertEqual(job._original_status, 'new')
+
+        job.status = 'scheduled'
+        job.save()
+        self.assertEqual(job._original_status, 'scheduled')
+
+
+class JobNoteThreadTestCase(JobTestCase):
+    """Test cases for JobNote threading"""
+
+    def test_thread_notes_from_any_node(self):
+        """Test the whole thread is returned depth-first from root or reply"""
+        root = JobNote.objects.create(job=self.job, content='Root')
+        reply = JobNote.objects.create(job=self.job, content='Reply', parent_note=root)
+        nested = JobNote.objects.create(job=self.job, content='Nested', parent_note=reply)
+        JobNote.objects.create(job=self.job, content='Unrelated')
+
+        expected = [root.id, reply.id, nested.id]
+        self.assertEqual([note.id for note in root.get_thread_notes()], expected)
+        self.assertEqual([note.id for note in nested.get_thread_notes()], expected)
+
+        with self.assertNumQueries(1):
+            reply.get_thread_notes()
+
+    def test_thread_serializer_loads_replies_once(self):
+        """Test nested replies are serialized from a single query"""
+        root = JobNote.objects.create(job=self.job, content='Root')
+        reply = JobNote.objects.create(job=self.job, content='Reply', parent_note=root)
+        JobNote.objects.create(job=self.job, content='Nested', parent_note=reply)
+
+        root = JobNote.objects.get(pk=root.pk)
+        with self.assertNumQueries(1):
+            data = JobNoteThreadSerializer(root).data
+
+        self.assertEqual(data['replies'][0]['content'], 'Reply')
+        self.assertEqual(data['replies'][0]['replies'][0]['content'], 'Nested')
+
+    def test_reply_count_is_maintained(self):
+        """Test the cached reply counter follows reply create/move/delete"""
+        root = JobNote.objects.create(job=self.job, content='Root')
+        other = JobNote.objects.create(job=self.job, content='Other')
+        reply = JobNote.objects.create(job=self.job, content='Reply', parent_note=root)
+
+        root.refresh_from_db()
+        self.assertEqual(root.reply_count, 1)
+        self.assertTrue(root.has_replies)
+
+        reply = JobNote.objects.get(pk=reply.pk)
+        reply.parent_note = other
+        reply.save()
+        root.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(root.reply_count, 0)
+        self.assertEqual(other.reply_count, 1)
+
+        reply.delete()
+        other.refresh_from_db()
+        self.assertFalse(other.has_replies)
+
+    def test_reply_count_ignores_resave_of_unloaded_reply(self):
+        """Test saving a reply built in memory with an existing pk does not count it again"""
+        root = JobNote.objects.create(job=self.job, content='Root')
+        reply = JobNote.objects.create(job=self.job, content='Reply', parent_note=root)
+
+        JobNote(
+            pk=reply.pk,
+            job=self.job,
+            content='Edited reply',
+            parent_note=root,
+            created_at=reply.created_at
+        ).save()
+
+        root.refresh_from_db()
+        self.assertEqual(root.reply_count, 1)
+
+
+class JobOverdueFlagTestCase(CustomerTestCase):
+    """Test cases for the stored overdue flag"""
+
+    def test_flag_follows_save(self):
+        """Test is_overdue_cached is refreshed when the job is saved"""
+        job = Job.objects.create(
+            customer=self.customer,
+            title='Late Job',
+            status='scheduled',
+            scheduled_date=datetime.date.today() - datetime.timedelta(days=2)
+        )
+        self.assertTrue(Job.objects.get(pk=job.pk).is_overdue_cached)
+
+        job.status = 'completed'
+        job.save(update_fields=['status'])
+        self.assertFalse(Job.objects.get(pk=job.pk).is_overdue_cached)
+
+    def test_refresh_task_flags_rolled_over_jobs(self):
+        """Test the nightly task flags jobs without a save"""
+        job = Job.objects.create(
+            customer=self.customer,
+            title='Rolled Over Job',
+            status='scheduled',
+            scheduled_date=datetime.date.today()
+        )
+        Job.objects.filter(pk=job.pk).update(
+            scheduled_date=datetime.date.today() - datetime.timedelta(days=1)
+        )
+
+        result = refresh_overdue_jobs()
+
+        self.assertEqual(result['flagged'], 1)
+        self.assertTrue(Job.objects.get(pk=job.pk).is_overdue_cached)
+
+
+class JobHistoryTestCase(JobTestCase):
+    """Test cases for JobHistory"""
+
+    def test_log_batch_inserts_all_entries(self):
+        """Test log_batch writes every entry in one statement"""
+        entries = [
+            {'job': self.job, 'history_type': 'updated', 'field_name': 'title', 'new_value': 'A'},
+            {'job': self.job, 'history_type': 'updated', 'field_name': 'priority', 'new_value': 'high'},
+        ]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            JobHistory.log_batch(entries)
+
+        self.assertEqual(JobHistory.objects.filter(job=self.job).count(), 2)
+
+
+class JobMaterialTestCase(JobTestCase):
+    """Test cases for normalized job materials"""
+
+    def test_set_materials_replaces_rows(self):
+        """Test set_materials swaps the job's material rows"""
+        shingles = InventoryItem.objects.create(name='Shingles', sku='SHINGLE-1')
+        nails = InventoryItem.objects.create(name='Nails', sku='NAIL-1')
+
+        self.job.set_materials([{'inventory_item': shingles.id, 'quantity': Decimal('30.00')}])
+        self.job.set_materials([
+            {'inventory_item': shingles.id, 'quantity': Decimal('20.00')},
+            {'inventory_item': nails.id, 'quantity': Decimal('5.00')},
+        ])
+
+        self.assertEqual(
+            list(self.job.materials.values_list('inventory_item_id', 'quantity')),
+            [(shingles.id, Decimal('20.00')), (nails.id, Decimal('5.00'))]
+        )
+        self.assertEqual(shingles.job_materials.count(), 1)
+
+
+class CachedFieldsSerializerTestCase(TestCase):
+    """Test cases for per-class serializer field caching"""
+
+    def test_instances_get_their_own_bound_fields(self):
+        """Test cached fields are copied per serializer instance"""
+        first = JobListSerializer()
+        second = JobListSerializer()
+
+        self.assertEqual(list(first.fields), list(second.fields))
+        self.assertIsNot(first.fields['status_color'], second.fields['status_color'])
+        self.assertIs(first.fields['status_color'].parent, first)
+        self.assertIs(second.fields['status_color'].parent, second)
+
+    def test_nested_fields_are_not_shared_between_contexts(self):
+        """Test nested serializers and relation children are per instance"""
+        class NestedJobSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
+            status_updates = JobStatusUpdateSerializer(many=True, read_only=True)
+
+            class Meta:
+                model = Job
+                fields = ['id', 'status_updates', 'assigned_technicians']
+
+        first = NestedJobSerializer(context={'name': 'first'})
+        second = NestedJobSerializer(context={'name': 'second'})
+
+        for name in ['status_updates', 'assigned_technicians']:
+            self.assertIsNot(first.fields[name], second.fields[name])
+        self.assertIsNot(first.fields['status_updates'].child, second.fields['status_updates'].child)
+        self.assertIsNot(
+            first.fields['assigned_technicians'].child_relation,
+            second.fields['assigned_technicians'].child_relation
+        )
+        self.assertEqual(first.fields['status_updates'].child.context['name'], 'first')
+        self.assertEqual(second.fields['status_updates'].child.context['name'], 'second')
+
+
+class JobDocumentSerializerTestCase(TestCase):
+    """Test cases for JobDocumentSerializer"""
+
+    def test_file_size_is_human_readable(self):
+        """Test file_size formats the stored byte count"""
+        serializer = JobDocumentSerializer()
+        self.assertEqual(serializer.get_file_size(JobDocument(file_size_bytes=512)), '512.0 B')
+        self.assertEqual(serializer.get_file_size(JobDocument(file_size_bytes=1536)), '1.5 KB')
+        self.assertEqual(serializer.get_file_size(JobDocument(file_size_bytes=0)), '0.0 B')
+        self.assertEqual(serializer.get_file_size(JobDocument()), 'Unknown')
+
+
+class AbsoluteURLMixinTestCase(TestCase):
+    """Test cases for absolute file URLs in serializers"""
+
+    def test_relative_urls_get_request_host(self):
+        """Test relative media paths are prefixed and absolute URLs kept"""
+        request = RequestFactory().get('/api/jobs/1/photos/')
+        serializer = JobPhotoSerializer(context={'request': request})
+
+        self.assertEqual(
+            serializer.absolute_url('/media/job_photos/roof.jpg'),
+            'http://testserver/media/job_photos/roof.jpg'
+        )
+        self.assertEqual(
+            serializer.absolute_url('https://cdn.example.com/roof.jpg'),
+            'https://cdn.example.com/roof.jpg'
+        )
+        self.assertEqual(
+            JobPhotoSerializer().absolute_url('/media/job_photos/roof.jpg'),
+            '/media/job_photos/roof.jpg'
+        )
+
+
+class SparseFieldsTestCase(TestCase):
+    """Test cases for ?fields= on the job detail serializer"""
+
+    def test_fields_param_limits_rendered_fields(self):
+        """Test only the requested fields are kept"""
+        request = api_request('/api/jobs/1/?fields=id,title')
+        self.assertEqual(set(JobDetailSerializer(context={'request': request}).fields), {'id', 'title'})
+
+        request = api_request('/api/jobs/1/')
+        self.assertIn('photos', JobDetailSerializer(context={'request': request}).fields)
+
+
+class JobCalendarRowTestCase(CustomerTestCase):
+    """Test cases for the calendar view's values() rows"""
+
+    def _calendar_row(self, job):
+        """Build the calendar view's row for a job"""
+        row = Job.objects.filter(pk=job.pk).values(
+            'id', 'job_number', 'title', 'status', 'priority', 'scheduled_date',
+            'scheduled_time', 'estimated_duration_hours', 'address',
+            'customer__first_name', 'customer__last_name', 'assigned_crew__name'
+        ).get()
+        return JobCalendarView._calendar_row(row)
+
+    def assertRowMatchesSerializer(self, job):
+        """Assert the rendered row equals JobCalendarSerializer output key for key"""
+        renderer = JSONRenderer()
+        row = json.loads(renderer.render(self._calendar_row(job)))
+        expected = json.loads(renderer.render(JobCalendarSerializer(Job.objects.get(pk=job.pk)).data))
+
+        self.assertEqual(set(row), set(expected))
+        for key, value in expected.items():
+            self.assertEqual(row[key], value, key)
+
+    def test_row_matches_calendar_serializer(self):
+        """Test calendar rows render like JobCalendarSerializer"""
+        crew = Crew.objects.create(name='North Crew')
+        job = Job.objects.create(
+            customer=self.customer,
+            title='Calendar Job',
+            assigned_crew=crew,
+            scheduled_date=datetime.date(2026, 10, 20),
+            scheduled_time=datetime.time(8, 30),
+            estimated_duration_hours=Decimal('2.5')
+        )
+
+        self.assertRowMatchesSerializer(job)
+
+    def test_row_matches_calendar_serializer_without_optional_fields(self):
+        """Test calendar rows match the serializer when crew, time and duration are unset"""
+        job = Job.objects.create(
+            customer=self.customer,
+            title='Unscheduled Calendar Job',
+            scheduled_date=datetime.date(2026, 10, 21)
+        )
+
+        self.assertRowMatchesSerializer(job)
+
+
+class JobDetailETagTestCase(JobTestCase):
+    """Test cases for the job detail and calendar ETags"""
+
+    def test_etag_changes_with_job(self):
+        """Test the ETag of a job-only response is stable until the job changes"""
+        request = api_request(f'/api/jobs/{self.job.pk}/?fields=id,title,status')
+
+        etag = job_detail_etag(request, self.job.pk)
+        self.assertIsNotNone(etag)
+        self.assertEqual(job_detail_etag(request, self.job.pk), etag)
+
+        self.job.title = 'Renamed Job'
+        self.job.save()
+        self.assertNotEqual(job_detail_etag(request, self.job.pk), etag)
+
+        self.assertIsNone(job_detail_etag(request, self.job.pk + 1000))
+
+    def test_no_etag_for_nested_data(self):
+        """Test responses with nested data are not given an ETag"""
+        self.assertIsNone(job_detail_etag(api_request(f'/api/jobs/{self.job.pk}/'), self.job.pk))
+        self.assertIsNone(
+            job_detail_etag(api_request(f'/api/jobs/{self.job.pk}/?fields=id,photos'), self.job.pk)
+        )
+
+    def test_calendar_etag_changes_with_jobs_in_range(self):
+        """Test the calendar ETag follows job saves without relying on the cache"""
+        job = Job.objects.create(
+            customer=self.customer,
+            title='Calendar ETag Job',
+            scheduled_date=datetime.date(2026, 10, 20)
+        )
+        request = api_request('/api/jobs/calendar/?start=2026-10-01&end=2026-10-31')
+
+        etag = job_calendar_etag(request)
+        self.assertEqual(job_calendar_etag(request), etag)
+
+        # A save in another process leaves this process's cache untouched
+        Job.objects.filter(pk=job.pk).update(title='Renamed Job', updated_at=timezone.now())
+        changed = job_calendar_etag(request)
+        self.assertNotEqual(changed, etag)
+
+        Job.objects.create(
+            customer=self.customer,
+            title='Second Calendar ETag Job',
+            scheduled_date=datetime.date(2026, 10, 21)
+        )
+        self.assertNotEqual(job_calendar_etag(request), changed)
+
+
+class JobListPaginationTestCase(TestCase):
+    """Test cases for the job list paginator choice"""
+
+    def _paginator_for(self, path):
+        view = JobListCreateView()
+        view.request = api_request(path)
+        return view.paginator
+
+    def test_page_numbers_by_default(self):
+        """Test the job list keeps page-number pagination without a cursor"""
+        self.assertIsInstance(self._paginator_for('/api/jobs/?page=2'), PageNumberPagination)
+
+    def test_cursor_pagination_is_opt_in(self):
+        """Test a cursor parameter switches the job list to cursor pagination"""
+        self.assertIsInstance(self._paginator_for('/api/jobs/?cursor='), JobCursorPagination)
@@ -1,20 +1,83 @@
+import hashlib
+
 from rest_framework import generics, status, permissions
+from rest_framework.pagination import CursorPagination
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from django.core.cache import cache
 from django.shortcuts import get_object_or_404
-from django.db.models import Q
+from django.db.models import Count, Max, Prefetch, Q
 from django.utils import timezone
-from .models import Job, JobPhoto, JobDocument
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+from .models import Job, JobPhoto, JobDocument, JobStatusUpdate
 from .serializers import (
     JobListSerializer,
     JobDetailSerializer,
     JobCreateSerializer,
     JobUpdateSerializer,
-    JobCalendarSerializer,
     JobPhotoSerializer,
     JobDocumentSerializer
 )
 from accounts.permissions import TechnicianAndAbove, ManagerAndAbove
+from technicians.models import TechnicianProfile
+
+
+def _make_etag(*parts):
+    return hashlib.md5(repr(parts).encode()).hexdigest()
+
+
+# Nested detail fields built from rows with no reliable change timestamp
+# (user names, photo/document edits, customer job stats)
+JOB_DETAIL_UNTRACKED_FIELDS = {
+    'customer', 'assigned_crew', 'assigned_technicians', 'photos', 'documents', 'status_updates'
+}
+
+
+def job_detail_etag(request, pk):
+    """
+    ETag for a job detail response restricted by ?fields= to the job's own
+    columns. Responses with nested data get no ETag, since edits to those
+    rows would not change it.
+    """
+    requested = JobDetailSerializer.get_requested_fields(request)
+    if requested is None or requested & JOB_DETAIL_UNTRACKED_FIELDS:
+        return None
+    updated_at = Job.objects.filter(pk=pk).values_list('updated_at', flat=True).first()
+    if updated_at is None:
+        return None
+    # is_overdue depends on the current date
+    return _make_etag(updated_at, timezone.now().date(), request.get_full_path())
+
+
+def job_calendar_etag(request):
+    """ETag for a calendar range: job count and latest job, customer and crew changes"""
+    start_date = request.GET.get('start')
+    end_date = request.GET.get('end')
+    if not start_date or not end_date:
+        return None
+    stamp = Job.objects.filter(
+        scheduled_date__gte=start_date,
+        scheduled_date__lte=end_date
+    ).aggregate(
+        jobs=Count('pk'),
+        updated=Max('updated_at'),
+        customers=Max('customer__updated_at'),
+        crews=Max('assigned_crew__updated_at')
+    )
+    return _make_etag(
+        stamp['jobs'], stamp['updated'], stamp['customers'], stamp['crews'], request.get_full_path()
+    )
+
+
+class JobCursorPagination(CursorPagination):
+    """
+    Opt-in keyset pagination for the job list: no COUNT(*) and no deep OFFSET scans.
+
+    Used when the request carries a ``cursor`` parameter (``?cursor=`` for the first page).
+    """
+    ordering = ('-created_at', '-id')
+    page_size = 50
 
 
 class JobListCreateView(generics.ListCreateAPIView):
@@ -23,6 +86,16 @@ class JobListCreateView(generics.ListCreateAPIView):
     """
     permission_classes = [TechnicianAndAbove]
 
+    @property
+    def paginator(self):
+        """Use cursor pagination when the client asks for it, page numbers otherwise"""
+        if not hasattr(self, '_paginator'):
+            if JobCursorPagination.cursor_query_param in self.request.query_params:
+                self._paginator = JobCursorPagination()
+            else:
+                self._paginator = super().paginator
+        return self._paginator
+
     def get_serializer_class(self):
         if self.request.method == 'POST':
             return JobCreateSerializer
@@ -47,12 +120,18 @@ class JobListCreateView(generics.ListCreateAPIView):
         if status_filter:
             queryset = queryset.filter(status=status_filter)
 
+        # Filter overdue jobs on the stored flag
+        if self.request.query_params.get('overdue') == 'true':
+            queryset = queryset.filter(is_overdue_cached=True)
+
+        # JobCursorPagination applies its own ordering when used
         return queryset.order_by('-scheduled_date', '-created_at')
 
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
 
 
+@method_decorator(condition(etag_func=job_detail_etag), name='get')
 class JobDetailView(generics.RetrieveUpdateDestroyAPIView):
     """
     Retrieve, update or delete a job.
@@ -60,12 +139,37 @@ class JobDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = Job.objects.select_related('customer', 'assigned_crew', 'created_by')
     permission_classes = [TechnicianAndAbove]
 
+    # Prefetches for JobDetailSerializer, keyed by the field that renders them
+    detail_prefetches = {
+        'assigned_technicians': Prefetch(
+            'assigned_technicians',
+            queryset=TechnicianProfile.objects.select_related('user').prefetch_related('certifications__skill')
+        ),
+        'assigned_crew': Prefetch('assigned_crew__members', queryset=TechnicianProfile.objects.select_related('user')),
+        'photos': Prefetch('photos', queryset=JobPhoto.objects.select_related('uploaded_by')),
+        'documents': Prefetch('documents', queryset=JobDocument.objects.select_related('uploaded_by')),
+        'status_updates': Prefetch('status_updates', queryset=JobStatusUpdate.objects.select_related('updated_by')),
+    }
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.method != 'GET':
+            return queryset
+
+        # Skip prefetches for fields left out by ?fields=
+        requested = JobDetailSerializer.get_requested_fields(self.request)
+        return queryset.prefetch_related(*(
+            prefetch for field_name, prefetch in self.detail_prefetches.items()
+            if requested is None or field_name in requested
+        ))
+
     def get_serializer_class(self):
         if self.request.method in ['PUT', 'PATCH']:
             return JobUpdateSerializer
         return JobDetailSerializer
 
 
+@method_decorator(condition(etag_func=job_calendar_etag), name='get')
 class JobCalendarView(APIView):
     """
     API for calendar views - returns jobs in a date range.
@@ -83,13 +187,32 @@ class JobCalendarView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+        # Plain rows with only the calendar columns; no model instances or serializer
         queryset = Job.objects.filter(
             scheduled_date__gte=start_date,
             scheduled_date__lte=end_date
-        ).select_related('customer', 'assigned_crew')
-
-        serializer = JobCalendarSerializer(queryset, many=True)
-        return Response(serializer.data)
+        ).values(
+            'id', 'job_number', 'title', 'status', 'priority', 'scheduled_date',
+            'scheduled_time', 'estimated_duration_hours', 'address',
+            'customer__first_name', 'customer__last_name', 'assigned_crew__name'
+        ).order_by('scheduled_date', 'scheduled_time', 'id')
+
+        return Response([self._calendar_row(row) for row in queryset])
+
+    @staticmethod
+    def _calendar_row(row):
+        """Shape a values() row like JobCalendarSerializer output"""
+        duration_hours = row['estimated_duration_hours']
+        first_name = row.pop('customer__first_name')
+        last_name = row.pop('customer__last_name')
+        row['customer_name'] = f"{first_name} {last_name}".strip()
+        crew_name = row.pop('assigned_crew__name')
+        if crew_name is not None:
+            # The serializer skips crew_name when the job has no crew
+            row['crew_name'] = crew_name
+        row['estimated_duration_hours'] = str(duration_hours) if duration_hours is not None else None
+        row['duration_display'] = Job.format_duration(duration_hours)
+        return row
 
 
 class JobPhotoListCreateView(generics.ListCreateAPIView):
@@ -102,7 +225,7 @@ class JobPhotoListCreateView(generics.ListCreateAPIView):
     def get_queryset(self):
         """Filter photos by job"""
         job_id = self.kwargs.get('job_id')
-        return JobPhoto.objects.filter(job_id=job_id)
+        return JobPhoto.objects.filter(job_id=job_id).select_related('uploaded_by')
 
     def perform_create(self, serializer):
         """Set job and uploaded_by"""
@@ -121,7 +244,7 @@ class JobDocumentListCreateView(generics.ListCreateAPIView):
     def get_queryset(self):
         """Filter documents by job"""
         job_id = self.kwargs.get('job_id')
-        return JobDocument.objects.filter(job_id=job_id)
+        return JobDocument.objects.filter(job_id=job_id).select_related('uploaded_by')
 
     def perform_create(self, serializer):
         """Set job and uploaded_by"""
@@ -148,16 +271,25 @@ class TechnicianJobsView(APIView):
         except:
             return Response({'error': 'Technician profile not found'}, status=404)
 
-        # Get today's jobs
+        # Get today's jobs (read-through cache, invalidated on job changes)
         today = timezone.now().date()
-        todays_jobs = Job.objects.filter(
-            Q(assigned_crew__members=tech_profile) | Q(assigned_technicians=tech_profile),
-            scheduled_date=today,
-            status__in=['scheduled', 'dispatched', 'in_progress']
-        ).distinct().select_related('customer', 'assigned_crew')
+        cache_key = f'jobs:technician_today:{tech_profile.pk}:{today}:{Job.get_cache_version()}'
+
+        def load_todays_jobs():
+            # Semi-joins on crew membership / direct assignment, no DISTINCT needed
+            crew_ids = tech_profile.crews.values('pk')
+            assigned_job_ids = Job.assigned_technicians.through.objects.filter(
+                technicianprofile_id=tech_profile.pk
+            ).values('job_id')
+            todays_jobs = Job.objects.filter(
+                Q(assigned_crew__in=crew_ids) | Q(pk__in=assigned_job_ids),
+                scheduled_date=today,
+                status__in=Job.OPEN_STATUSES
+            ).select_related('customer', 'assigned_crew')
+            return JobListSerializer(todays_jobs, many=True).data
 
         return Response({
-            'todays_jobs': JobListSerializer(todays_jobs, many=True).data
+            'todays_jobs': cache.get_or_set(cache_key, load_todays_jobs, 60)
         })
 
 
@@ -180,16 +312,15 @@ class JobStatusUpdateView(APIView):
         user = request.user
         can_update = False
 
-        if user.is_admin or user.is_manager or user.is_owner:
+        if user.is_manager_or_above:
             can_update = True
         elif user.is_technician:
             try:
                 tech_profile = user.technician_profile
                 can_update = (
-                    job.assigned_crew and tech_profile in job.assigned_crew.members.all()
-                ) or (
-                    tech_profile in job.assigned_technicians.all()
-                )
+                    job.assigned_crew_id is not None
+                    and tech_profile.crews.filter(pk=job.assigned_crew_id).exists()
+                ) or job.assigned_technicians.filter(pk=tech_profile.pk).exists()
             except:
                 can_update = False
 
@@ -199,13 +330,17 @@ class JobStatusUpdateView(APIView):
         # Update job status
         old_status = job.status
         job.status = new_status
+        update_fields = ['status', 'updated_at']
 
         # Set timestamps based on status
         if new_status == 'in_progress' and not job.actual_start_time:
             job.actual_start_time = timezone.now()
+            update_fields.append('actual_start_time')
         elif new_status == 'completed' and not job.actual_end_time:
             job.actual_end_time = timezone.now()
+            update_fields.append('actual_end_time')
 
-        job.save()
+        # Write only the changed columns; post_save still queues notifications
+        job.save(update_fields=update_fields)
 
         return Response({'message': 'Job status updated successfully'})
@@ -11,6 +11,7 @@ class NotificationTemplateAdmin(admin.ModelAdmin):
         'name', 'template_type', 'notification_method', 'is_active',
         'send_to_customer', 'send_to_technician', 'created_by', 'created_at'
     ]
+    list_select_related = ['created_by']
     list_filter = [
         'template_type', 'notification_method', 'is_active',
         'send_to_customer', 'send_to_technician', 'send_to_office',
@@ -45,10 +46,15 @@ class NotificationTemplateAdmin(admin.ModelAdmin):
     readonly_fields = ['created_at', 'updated_at', 'created_by']
 
     def save_model(self, request, obj, form, change):
-        """Set created_by when creating new templates"""
+        """Set created_by when creating new templates; on edits write only the changed columns"""
         if not change:
             obj.created_by = request.user
-        super().save_model(request, obj, form, change)
+            super().save_model(request, obj, form, change)
+            return
+        concrete_fields = {field.name for field in obj._meta.concrete_fields}
+        changed_fields = [name for name in form.changed_data if name in concrete_fields]
+        if changed_fields:
+            obj.save(update_fields=changed_fields + ['updated_at'])
 
 
 @admin.register(NotificationLog)
@@ -60,14 +66,14 @@ class NotificationLogAdmin(admin.ModelAdmin):
         'id', 'notification_type', 'recipient_info', 'template_name',
         'status', 'sent_at', 'created_at'
     ]
+    list_select_related = ['template', 'job', 'customer', 'technician__user']
     list_filter = [
         'notification_type', 'status', 'created_at', 'sent_at',
         'template__template_type', 'template__notification_method'
     ]
-    search_fields = [
-        'recipient_email', 'recipient_phone', 'subject', 'content',
-        'job__job_number', 'customer__email', 'technician__user__email'
-    ]
+    # Recipients are denormalized onto the log row, so search it directly
+    # rather than joining customers and technician users
+    search_fields = ['recipient_email', 'recipient_phone', 'subject', 'job__job_number']
     ordering = ['-created_at']
     readonly_fields = [
         'id', 'sent_at', 'delivered_at', 'external_id', 'error_message',
@@ -94,6 +100,17 @@ class NotificationLogAdmin(admin.ModelAdmin):
         }),
     )
 
+    # Long text columns that the changelist never renders
+    changelist_deferred_fields = ['subject', 'content', 'error_message']
+
+    def get_queryset(self, request):
+        """Optimize queryset for admin"""
+        queryset = super().get_queryset(request)
+        changelist_url_name = f'{self.opts.app_label}_{self.opts.model_name}_changelist'
+        if request.resolver_match and request.resolver_match.url_name == changelist_url_name:
+            queryset = queryset.defer(*self.changelist_deferred_fields)
+        return queryset
+
     def recipient_info(self, obj):
         """Display recipient information"""
         if obj.recipient_email:
@@ -128,14 +145,6 @@ class NotificationSettingsAdmin(admin.ModelAdmin):
         return False
 
     fieldsets = (
-        ('Service Configurations', {
-            'fields': ('twilio_account_sid', 'twilio_auth_token', 'twilio_phone_number'),
-            'classes': ('collapse',)
-        }),
-        ('Email Configuration', {
-            'fields': ('sendgrid_api_key', 'sendgrid_from_email', 'sendgrid_from_name'),
-            'classes': ('collapse',)
-        }),
         ('Global Settings', {
             'fields': ('enable_sms_notifications', 'enable_email_notifications', 'default_timezone')
         }),
@@ -157,6 +166,6 @@ class NotificationSettingsAdmin(admin.ModelAdmin):
     def get_queryset(self, request):
         """Always return the singleton instance"""
         qs = super().get_queryset(request)
-        # This will create the instance if it doesn't exist
+        # This will create the instance if it doesn't exist (cached after the first call)
         NotificationSettings.get_settings()
         return qs
@@ -1,73 +1,72 @@
 from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
 from notifications.models import NotificationTemplate
 
 
-class Command(BaseCommand):
-    help = 'Load default notification templates'
-
-    def handle(self, *args, **options):
-        templates_data = [
-            # SMS Templates
-            {
-                'name': 'Appointment Confirmation - SMS',
-                'template_type': 'appointment_confirmation',
-                'notification_method': 'sms',
-                'subject': '',
-                'content': 'Hi {{customer_name}}! Your {{job_title}} appointment is confirmed for {{scheduled_date}} at {{scheduled_time}}. {{company_name}} - {{company_phone}}',
-                'is_active': True,
-                'send_to_customer': True,
-                'trigger_on_job_create': True,
-            },
-            {
-                'name': 'Appointment Reminder - SMS',
-                'template_type': 'appointment_reminder',
-                'notification_method': 'sms',
-                'subject': '',
-                'content': 'Hi {{customer_name}}! Reminder: Your {{job_title}} is scheduled for tomorrow at {{scheduled_time}}. {{company_name}} - {{company_phone}}',
-                'is_active': True,
-                'send_before_hours': 24,
-                'send_to_customer': True,
-            },
-            {
-                'name': 'Job Status Update - SMS',
-                'template_type': 'job_status_update',
-                'notification_method': 'sms',
-                'subject': '',
-                'content': 'Hi {{customer_name}}! Your {{job_title}} status changed from {{old_status}} to {{new_status}}. {{company_name}}',
-                'is_active': True,
-                'send_to_customer': True,
-                'trigger_on_status_change': True,
-                'trigger_statuses': ['dispatched', 'in_progress', 'completed', 'cancelled'],
-            },
-            {
-                'name': 'Job Assigned to Technician - SMS',
-                'template_type': 'job_assigned',
-                'notification_method': 'sms',
-                'subject': '',
-                'content': 'Hi {{technician_name}}! You have been assigned to {{job_title}} for {{customer_name}} on {{scheduled_date}} at {{scheduled_time}}.',
-                'is_active': True,
-                'send_to_technician': True,
-                'trigger_on_job_update': True,
-            },
-            {
-                'name': 'Job Completed - SMS',
-                'template_type': 'job_completed',
-                'notification_method': 'sms',
-                'subject': '',
-                'content': 'Hi {{customer_name}}! Your {{job_title}} has been completed. Thank you for choosing {{company_name}}!',
-                'is_active': True,
-                'send_to_customer': True,
-                'trigger_on_status_change': True,
-                'trigger_statuses': ['completed'],
-            },
-
-            # Email Templates
-            {
-                'name': 'Appointment Confirmation - Email',
-                'template_type': 'appointment_confirmation',
-                'notification_method': 'email',
-                'subject': 'Appointment Confirmed - {{job_title}}',
-                'content': '''Hi {{customer_name}},
+# Default templates, one per (template_type, notification_method)
+_DEFAULT_TEMPLATES = (
+    # SMS Templates
+    {
+        'name': 'Appointment Confirmation - SMS',
+        'template_type': 'appointment_confirmation',
+        'notification_method': 'sms',
+        'subject': '',
+        'content': 'Hi {{customer_name}}! Your {{job_title}} appointment is confirmed for {{scheduled_date}} at {{scheduled_time}}. {{company_name}} - {{company_phone}}',
+        'is_active': True,
+        'send_to_customer': True,
+        'trigger_on_job_create': True,
+    },
+    {
+        'name': 'Appointment Reminder - SMS',
+        'template_type': 'appointment_reminder',
+        'notification_method': 'sms',
+        'subject': '',
+        'content': 'Hi {{customer_name}}! Reminder: Your {{job_title}} is scheduled for tomorrow at {{scheduled_time}}. {{company_name}} - {{company_phone}}',
+        'is_active': True,
+        'send_before_hours': 24,
+        'send_to_customer': True,
+    },
+    {
+        'name': 'Job Status Update - SMS',
+        'template_type': 'job_status_update',
+        'notification_method': 'sms',
+        'subject': '',
+        'content': 'Hi {{customer_name}}! Your {{job_title}} status changed from {{old_status}} to {{new_status}}. {{company_name}}',
+        'is_active': True,
+        'send_to_customer': True,
+        'trigger_on_status_change': True,
+        'trigger_statuses': ['dispatched', 'in_progress', 'completed', 'cancelled'],
+    },
+    {
+        'name': 'Job Assigned to Technician - SMS',
+        'template_type': 'job_assigned',
+        'notification_method': 'sms',
+        'subject': '',
+        'content': 'Hi {{technician_name}}! You have been assigned to {{job_title}} for {{customer_name}} on {{scheduled_date}} at {{scheduled_time}}.',
+        'is_active': True,
+        'send_to_technician': True,
+        'trigger_on_job_update': True,
+    },
+    {
+        'name': 'Job Completed - SMS',
+        'template_type': 'job_completed',
+        'notification_method': 'sms',
+        'subject': '',
+        'content': 'Hi {{customer_name}}! Your {{job_title}} has been completed. Thank you for choosing {{company_name}}!',
+        'is_active': True,
+        'send_to_customer': True,
+        'trigger_on_status_change': True,
+        'trigger_statuses': ['completed'],
+    },
+
+    # Email Templates
+    {
+        'name': 'Appointment Confirmation - Email',
+        'template_type': 'appointment_confirmation',
+        'notification_method': 'email',
+        'subject': 'Appointment Confirmed - {{job_title}}',
+        'content': '''Hi {{customer_name}},
 
 Your appointment has been confirmed!
 
@@ -84,16 +83,16 @@ Best regards,
 {{company_name}} Team
 {{company_phone}}
 {{company_website}}''',
-                'is_active': True,
-                'send_to_customer': True,
-                'trigger_on_job_create': True,
-            },
-            {
-                'name': 'Welcome New Customer - Email',
-                'template_type': 'welcome_customer',
-                'notification_method': 'email',
-                'subject': 'Welcome to {{company_name}}!',
-                'content': '''Hi {{customer_name}},
+        'is_active': True,
+        'send_to_customer': True,
+        'trigger_on_job_create': True,
+    },
+    {
+        'name': 'Welcome New Customer - Email',
+        'template_type': 'welcome_customer',
+        'notification_method': 'email',
+        'subject': 'Welcome to {{company_name}}!',
+        'content': '''Hi {{customer_name}},
 
 Welcome to {{company_name}}! We're excited to have you as a customer.
 
@@ -107,36 +106,59 @@ Thank you for choosing {{company_name}}!
 
 Best regards,
 {{company_name}} Team''',
-                'is_active': True,
-                'send_to_customer': True,
-            },
-        ]
-
-        created_count = 0
-        updated_count = 0
-
-        for template_data in templates_data:
-            template, created = NotificationTemplate.objects.get_or_create(
-                template_type=template_data['template_type'],
-                notification_method=template_data['notification_method'],
-                defaults=template_data
+        'is_active': True,
+        'send_to_customer': True,
+    },
+)
+
+
+class Command(BaseCommand):
+    help = 'Load default notification templates'
+
+    def handle(self, *args, **options):
+        # Fetch existing templates once, keyed like the unique constraint
+        keys = {(data['template_type'], data['notification_method']) for data in _DEFAULT_TEMPLATES}
+        existing = {
+            (template.template_type, template.notification_method): template
+            for template in NotificationTemplate.objects.filter(
+                template_type__in={template_type for template_type, _ in keys},
+                notification_method__in={method for _, method in keys}
             )
+        }
+
+        to_create = []
+        to_update = []
+        update_fields = {'updated_at'}
+        now = timezone.now()
 
-            if created:
-                created_count += 1
+        for template_data in _DEFAULT_TEMPLATES:
+            template = existing.get((template_data['template_type'], template_data['notification_method']))
+            if template is None:
+                to_create.append(NotificationTemplate(**template_data))
                 self.stdout.write(
-                    self.style.SUCCESS(f'Created template: {template.name}')
+                    self.style.SUCCESS(f"Created template: {template_data['name']}")
                 )
             else:
                 # Update existing template
                 for key, value in template_data.items():
                     setattr(template, key, value)
-                template.save()
-                updated_count += 1
+                template.updated_at = now
+                update_fields.update(template_data)
+                to_update.append(template)
                 self.stdout.write(
                     self.style.WARNING(f'Updated template: {template.name}')
                 )
 
+        with transaction.atomic():
+            NotificationTemplate.objects.bulk_create(to_create, batch_size=500)
+            NotificationTemplate.objects.bulk_update(to_update, sorted(update_fields), batch_size=500)
+
+        # Bulk writes skip the model signals that clear the template cache
+        NotificationTemplate.clear_trigger_cache()
+
+        created_count = len(to_create)
+        updated_count = len(to_update)
+
         self.stdout.write(
             self.style.SUCCESS(
                 f'Successfully processed {created_count + updated_count} templates '
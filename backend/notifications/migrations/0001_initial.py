@@ -0,0 +1,498 @@
+# Generated by Django 4.2.24 on 2026-10-16 15:10
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("technicians", "0001_initial"),
+        ("customers", "0001_initial"),
+        ("jobs", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NotificationSettings",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "twilio_account_sid",
+                    models.CharField(
+                        blank=True, help_text="Twilio Account SID", max_length=100
+                    ),
+                ),
+                (
+                    "twilio_auth_token",
+                    models.CharField(
+                        blank=True, help_text="Twilio Auth Token", max_length=100
+                    ),
+                ),
+                (
+                    "twilio_phone_number",
+                    models.CharField(
+                        blank=True,
+                        help_text="Twilio phone number for sending SMS",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "sendgrid_api_key",
+                    models.CharField(
+                        blank=True, help_text="SendGrid API Key", max_length=200
+                    ),
+                ),
+                (
+                    "sendgrid_from_email",
+                    models.EmailField(
+                        blank=True,
+                        help_text="Default from email address for SendGrid",
+                        max_length=254,
+                    ),
+                ),
+                (
+                    "sendgrid_from_name",
+                    models.CharField(
+                        blank=True,
+                        help_text="Default from name for SendGrid",
+                        max_length=100,
+                    ),
+                ),
+                (
+                    "enable_sms_notifications",
+                    models.BooleanField(
+                        default=True, help_text="Enable SMS notifications globally"
+                    ),
+                ),
+                (
+                    "enable_email_notifications",
+                    models.BooleanField(
+                        default=True, help_text="Enable email notifications globally"
+                    ),
+                ),
+                (
+                    "default_timezone",
+                    models.CharField(
+                        default="America/New_York",
+                        help_text="Default timezone for scheduling notifications",
+                        max_length=50,
+                    ),
+                ),
+                (
+                    "company_name",
+                    models.CharField(
+                        default="Roofing Platform",
+                        help_text="Company name used in notification templates",
+                        max_length=100,
+                    ),
+                ),
+                (
+                    "company_phone",
+                    models.CharField(
+                        blank=True,
+                        help_text="Company phone number for notifications",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "company_website",
+                    models.URLField(blank=True, help_text="Company website URL"),
+                ),
+                (
+                    "enable_appointment_reminders",
+                    models.BooleanField(
+                        default=True, help_text="Enable automatic appointment reminders"
+                    ),
+                ),
+                (
+                    "reminder_hours_before",
+                    models.PositiveIntegerField(
+                        default=24,
+                        help_text="Send appointment reminders this many hours before",
+                    ),
+                ),
+                (
+                    "enable_job_status_notifications",
+                    models.BooleanField(
+                        default=True,
+                        help_text="Enable automatic job status notifications",
+                    ),
+                ),
+                (
+                    "enable_technician_notifications",
+                    models.BooleanField(
+                        default=True, help_text="Enable notifications to technicians"
+                    ),
+                ),
+                (
+                    "cleanup_old_logs_days",
+                    models.PositiveIntegerField(
+                        default=90,
+                        help_text="Delete notification logs older than this many days",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Notification Settings",
+                "verbose_name_plural": "Notification Settings",
+            },
+        ),
+        migrations.CreateModel(
+            name="NotificationTemplate",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(
+                        help_text="Display name for the template", max_length=100
+                    ),
+                ),
+                (
+                    "template_type",
+                    models.CharField(
+                        choices=[
+                            ("appointment_confirmation", "Appointment Confirmation"),
+                            ("appointment_reminder", "Appointment Reminder"),
+                            ("job_status_update", "Job Status Update"),
+                            ("job_assigned", "Job Assigned to Technician"),
+                            ("job_completed", "Job Completed"),
+                            ("job_cancelled", "Job Cancelled"),
+                            ("welcome_customer", "Welcome New Customer"),
+                            ("payment_reminder", "Payment Reminder"),
+                            ("feedback_request", "Feedback Request"),
+                        ],
+                        help_text="The type of notification this template is for",
+                        max_length=50,
+                    ),
+                ),
+                (
+                    "notification_method",
+                    models.CharField(
+                        choices=[("sms", "SMS"), ("email", "Email")],
+                        help_text="SMS or Email",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "subject",
+                    models.CharField(
+                        blank=True,
+                        help_text="Email subject line (ignored for SMS)",
+                        max_length=200,
+                    ),
+                ),
+                (
+                    "content",
+                    models.TextField(
+                        help_text="Template content with placeholders like {{customer_name}}, {{job_title}}, etc."
+                    ),
+                ),
+                (
+                    "is_active",
+                    models.BooleanField(
+                        default=True,
+                        help_text="Whether this template is active and available for use",
+                    ),
+                ),
+                (
+                    "send_before_hours",
+                    models.PositiveIntegerField(
+                        blank=True,
+                        help_text="Send notification this many hours before scheduled time (for reminders)",
+                        null=True,
+                    ),
+                ),
+                (
+                    "send_to_customer",
+                    models.BooleanField(default=True, help_text="Send to customer"),
+                ),
+                (
+                    "send_to_technician",
+                    models.BooleanField(
+                        default=False, help_text="Send to assigned technician"
+                    ),
+                ),
+                (
+                    "send_to_office",
+                    models.BooleanField(
+                        default=False, help_text="Send to office/managers"
+                    ),
+                ),
+                (
+                    "trigger_on_job_create",
+                    models.BooleanField(
+                        default=False, help_text="Send when job is created"
+                    ),
+                ),
+                (
+                    "trigger_on_job_update",
+                    models.BooleanField(
+                        default=False, help_text="Send when job is updated"
+                    ),
+                ),
+                (
+                    "trigger_on_status_change",
+                    models.BooleanField(
+                        default=False, help_text="Send when job status changes"
+                    ),
+                ),
+                (
+                    "trigger_statuses",
+                    models.JSONField(
+                        blank=True,
+                        help_text="Specific statuses that trigger this notification (if trigger_on_status_change is True)",
+                        null=True,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        help_text="User who created this template",
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="created_notification_templates",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Notification Template",
+                "verbose_name_plural": "Notification Templates",
+                "ordering": ["template_type", "notification_method", "name"],
+                "unique_together": {("template_type", "notification_method")},
+            },
+        ),
+        migrations.CreateModel(
+            name="NotificationLog",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "notification_type",
+                    models.CharField(
+                        choices=[("sms", "SMS"), ("email", "Email")],
+                        help_text="Type of notification sent",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "recipient_email",
+                    models.EmailField(
+                        blank=True,
+                        help_text="Email address of recipient (for email notifications)",
+                        max_length=254,
+                    ),
+                ),
+                (
+                    "recipient_phone",
+                    models.CharField(
+                        blank=True,
+                        help_text="Phone number of recipient (for SMS notifications)",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "subject",
+                    models.CharField(
+                        blank=True,
+                        help_text="Email subject or SMS preview",
+                        max_length=200,
+                    ),
+                ),
+                (
+                    "content",
+                    models.TextField(help_text="Full content of the notification"),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("sent", "Sent"),
+                            ("delivered", "Delivered"),
+                            ("failed", "Failed"),
+                            ("bounced", "Bounced"),
+                        ],
+                        default="pending",
+                        help_text="Delivery status of the notification",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "sent_at",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="When the notification was sent",
+                        null=True,
+                    ),
+                ),
+                (
+                    "delivered_at",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="When the notification was delivered (if available)",
+                        null=True,
+                    ),
+                ),
+                (
+                    "external_id",
+                    models.CharField(
+                        blank=True,
+                        help_text="External service ID (Twilio SID, SendGrid message ID, etc.)",
+                        max_length=100,
+                    ),
+                ),
+                (
+                    "error_message",
+                    models.TextField(
+                        blank=True, help_text="Error message if delivery failed"
+                    ),
+                ),
+                (
+                    "retry_count",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Number of retry attempts"
+                    ),
+                ),
+                (
+                    "max_retries",
+                    models.PositiveIntegerField(
+                        default=3, help_text="Maximum number of retry attempts"
+                    ),
+                ),
+                (
+                    "next_retry_at",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="When to attempt the next retry",
+                        null=True,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        help_text="User who triggered this notification",
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="sent_notifications",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "customer",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Related customer (if applicable)",
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="notifications",
+                        to="customers.customer",
+                    ),
+                ),
+                (
+                    "job",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Related job (if applicable)",
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="notifications",
+                        to="jobs.job",
+                    ),
+                ),
+                (
+                    "technician",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Related technician (if applicable)",
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="notifications",
+                        to="technicians.technicianprofile",
+                    ),
+                ),
+                (
+                    "template",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Template used for this notification",
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="logs",
+                        to="notifications.notificationtemplate",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Notification Log",
+                "verbose_name_plural": "Notification Logs",
+                "ordering": ["-created_at"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="notificationlog",
+            index=models.Index(
+                fields=["job", "created_at"], name="notificatio_job_id_476d7f_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="notificationlog",
+            index=models.Index(
+                fields=["customer", "created_at"], name="notificatio_custome_f0a166_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="notificationlog",
+            index=models.Index(
+                fields=["technician", "created_at"],
+                name="notificatio_technic_5a2edf_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="notificationlog",
+            index=models.Index(
+                fields=["status", "created_at"], name="notificatio_status_68c9bc_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="notificationlog",
+            index=models.Index(
+                fields=["notification_type", "status"],
+                name="notificatio_notific_219496_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.24 on 2026-10-16 15:12
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifications", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="notificationsettings",
+            name="sendgrid_api_key",
+        ),
+        migrations.RemoveField(
+            model_name="notificationsettings",
+            name="sendgrid_from_email",
+        ),
+        migrations.RemoveField(
+            model_name="notificationsettings",
+            name="sendgrid_from_name",
+        ),
+        migrations.RemoveField(
+            model_name="notificationsettings",
+            name="twilio_account_sid",
+        ),
+        migrations.RemoveField(
+            model_name="notificationsettings",
+            name="twilio_auth_token",
+        ),
+        migrations.RemoveField(
+            model_name="notificationsettings",
+            name="twilio_phone_number",
+        ),
+    ]
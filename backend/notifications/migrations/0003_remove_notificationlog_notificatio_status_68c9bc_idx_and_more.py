@@ -0,0 +1,28 @@
+# Generated by Django 4.2.24 on 2026-10-16 15:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifications", "0002_remove_notificationsettings_sendgrid_api_key_and_more"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="notificationlog",
+            name="notificatio_status_68c9bc_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="notificationlog",
+            name="notificatio_notific_219496_idx",
+        ),
+        migrations.AddIndex(
+            model_name="notificationlog",
+            index=models.Index(
+                fields=["status", "notification_type", "created_at"],
+                name="nl_stn_ct",
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.24 on 2026-10-16 15:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifications", "0003_remove_notificationlog_notificatio_status_68c9bc_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="notificationlog",
+            index=models.Index(
+                condition=models.Q(("status__in", ["failed", "bounced"])),
+                fields=["next_retry_at"],
+                name="nl_retry_pending",
+            ),
+        ),
+    ]
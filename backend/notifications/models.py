@@ -1,11 +1,104 @@
-from django.db import models
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+
+from django.db import models, transaction
 from django.conf import settings
+from django.core.cache import cache
 from django.utils.translation import gettext_lazy as _
 from django.template import Template, Context
+from django.template.base import render_value_in_context
 from django.core.mail import send_mail
 from django.utils import timezone
 
 
+# Placeholder variables available to each template type
+_PLACEHOLDERS = MappingProxyType({
+    'appointment_confirmation': (
+        'customer_name', 'customer_email', 'customer_phone',
+        'job_title', 'job_number', 'scheduled_date', 'scheduled_time',
+        'job_address', 'company_name', 'contact_phone'
+    ),
+    'appointment_reminder': (
+        'customer_name', 'customer_email', 'customer_phone',
+        'job_title', 'job_number', 'scheduled_date', 'scheduled_time',
+        'job_address', 'company_name', 'contact_phone', 'hours_until'
+    ),
+    'job_status_update': (
+        'customer_name', 'customer_email', 'customer_phone',
+        'job_title', 'job_number', 'old_status', 'new_status',
+        'scheduled_date', 'scheduled_time', 'job_address',
+        'technician_name', 'technician_phone', 'company_name'
+    ),
+    'job_assigned': (
+        'technician_name', 'technician_email', 'technician_phone',
+        'customer_name', 'job_title', 'job_number', 'scheduled_date',
+        'scheduled_time', 'job_address', 'company_name'
+    ),
+    'job_completed': (
+        'customer_name', 'customer_email', 'customer_phone',
+        'job_title', 'job_number', 'completion_date', 'job_address',
+        'technician_name', 'company_name', 'feedback_link'
+    ),
+    'welcome_customer': (
+        'customer_name', 'customer_email', 'company_name',
+        'contact_phone', 'website_url'
+    ),
+})
+
+
+# Identifier names only; other {{ ... }} content (numbers, filters, lookups)
+# is left to the Django template engine
+_PLACEHOLDER_RE = re.compile(r'\{\{\s*([A-Za-z_]\w*)\s*\}\}')
+
+
+class _MissingAsEmpty(dict):
+    def __missing__(self, key):
+        return ''
+
+
+class _PlaceholderTemplate:
+    """
+    Renders content made only of plain {{ name }} placeholders with
+    str.format_map, formatting each value the way a Django Template
+    would (localization and autoescaping).
+    """
+
+    def __init__(self, source):
+        pieces = _PLACEHOLDER_RE.split(source)
+        # split() alternates literal text and placeholder names
+        self.names = frozenset(pieces[1::2])
+        self.format_string = ''.join(
+            piece.replace('{', '{{').replace('}', '}}') if index % 2 == 0 else '{' + piece + '}'
+            for index, piece in enumerate(pieces)
+        )
+
+    def render(self, context):
+        values = _MissingAsEmpty()
+        for name in self.names:
+            # Unknown names render empty, as with Django's default string_if_invalid
+            if name in context:
+                value = context[name]
+                if callable(value):
+                    value = value()
+                values[name] = render_value_in_context(value, context)
+        return self.format_string.format_map(values)
+
+
+@lru_cache(maxsize=512)
+def _compile_template(source):
+    """
+    Compile a template string once; renders reuse the result. Simple
+    placeholder-only content skips the Django template engine.
+    """
+    if '{%' not in source and '{#' not in source:
+        remainder = _PLACEHOLDER_RE.sub('', source)
+        if '{{' not in remainder and '}}' not in remainder:
+            return _PlaceholderTemplate(source)
+    return Template(source)
+
+
 class NotificationTemplate(models.Model):
     """
     Configurable templates for different types of notifications.
@@ -116,6 +209,17 @@ class NotificationTemplate(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    TRIGGER_FIELDS = {
+        'job_create': 'trigger_on_job_create',
+        'job_update': 'trigger_on_job_update',
+        'status_change': 'trigger_on_status_change',
+    }
+    TRIGGER_CACHE_KEY = 'notifications:templates:{trigger}'
+    # Also bounds staleness in other processes when the cache is not shared
+    TRIGGER_CACHE_TIMEOUT = 300
+    ACTIVE_MAP_CACHE_KEY = 'notifications:templates:active'
+    STATUS_MAP_CACHE_KEY = 'notifications:templates:by_status'
+
     class Meta:
         ordering = ['template_type', 'notification_method', 'name']
         verbose_name = 'Notification Template'
@@ -125,11 +229,62 @@ class NotificationTemplate(models.Model):
     def __str__(self):
         return f"{self.get_template_type_display()} - {self.get_notification_method_display()} - {self.name}"
 
+    @classmethod
+    def get_trigger_templates(cls, trigger):
+        """
+        Return active templates for a job trigger ('job_create', 'job_update'
+        or 'status_change'). Cached and cleared by the notifications signals.
+        """
+        cache_key = cls.TRIGGER_CACHE_KEY.format(trigger=trigger)
+        templates = cache.get(cache_key)
+        if templates is None:
+            templates = list(cls.objects.filter(is_active=True, **{cls.TRIGGER_FIELDS[trigger]: True}))
+            cache.set(cache_key, templates, cls.TRIGGER_CACHE_TIMEOUT)
+        return templates
+
+    @classmethod
+    def get_status_change_templates(cls, status):
+        """
+        Return active status-change templates whose trigger_statuses include
+        the given status, from a cached status -> templates map.
+        """
+        templates_by_status = cache.get(cls.STATUS_MAP_CACHE_KEY)
+        if templates_by_status is None:
+            templates_by_status = {}
+            for template in cls.get_trigger_templates('status_change'):
+                for trigger_status in template.trigger_statuses or []:
+                    templates_by_status.setdefault(trigger_status, []).append(template)
+            cache.set(cls.STATUS_MAP_CACHE_KEY, templates_by_status, cls.TRIGGER_CACHE_TIMEOUT)
+        return templates_by_status.get(status, [])
+
+    @classmethod
+    def active_map(cls):
+        """
+        Return active templates keyed by (template_type, notification_method).
+        Cached and cleared by the notifications signals.
+        """
+        templates = cache.get(cls.ACTIVE_MAP_CACHE_KEY)
+        if templates is None:
+            templates = {
+                (template.template_type, template.notification_method): template
+                for template in cls.objects.filter(is_active=True)
+            }
+            cache.set(cls.ACTIVE_MAP_CACHE_KEY, templates, cls.TRIGGER_CACHE_TIMEOUT)
+        return templates
+
+    @classmethod
+    def clear_trigger_cache(cls):
+        """Drop the cached per-trigger template lists and template maps"""
+        cache.delete_many(
+            [cls.TRIGGER_CACHE_KEY.format(trigger=trigger) for trigger in cls.TRIGGER_FIELDS]
+            + [cls.ACTIVE_MAP_CACHE_KEY, cls.STATUS_MAP_CACHE_KEY]
+        )
+
     def render_content(self, context_data):
         """
         Render the template content with provided context data.
         """
-        template = Template(self.content)
+        template = _compile_template(self.content)
         context = Context(context_data)
         return template.render(context)
 
@@ -139,47 +294,28 @@ class NotificationTemplate(models.Model):
         """
         if not self.subject:
             return ""
-        template = Template(self.subject)
+        template = _compile_template(self.subject)
         context = Context(context_data)
         return template.render(context)
 
+    def uses_placeholders(self, names):
+        """
+        Whether the subject or content may reference any of the given
+        placeholder names. Templates using tags are assumed to.
+        """
+        for source in (self.subject, self.content):
+            if not source:
+                continue
+            compiled = _compile_template(source)
+            if not isinstance(compiled, _PlaceholderTemplate) or compiled.names & names:
+                return True
+        return False
+
     def get_available_placeholders(self):
         """
         Return a list of available placeholder variables for this template type.
         """
-        placeholders = {
-            'appointment_confirmation': [
-                'customer_name', 'customer_email', 'customer_phone',
-                'job_title', 'job_number', 'scheduled_date', 'scheduled_time',
-                'job_address', 'company_name', 'contact_phone'
-            ],
-            'appointment_reminder': [
-                'customer_name', 'customer_email', 'customer_phone',
-                'job_title', 'job_number', 'scheduled_date', 'scheduled_time',
-                'job_address', 'company_name', 'contact_phone', 'hours_until'
-            ],
-            'job_status_update': [
-                'customer_name', 'customer_email', 'customer_phone',
-                'job_title', 'job_number', 'old_status', 'new_status',
-                'scheduled_date', 'scheduled_time', 'job_address',
-                'technician_name', 'technician_phone', 'company_name'
-            ],
-            'job_assigned': [
-                'technician_name', 'technician_email', 'technician_phone',
-                'customer_name', 'job_title', 'job_number', 'scheduled_date',
-                'scheduled_time', 'job_address', 'company_name'
-            ],
-            'job_completed': [
-                'customer_name', 'customer_email', 'customer_phone',
-                'job_title', 'job_number', 'completion_date', 'job_address',
-                'technician_name', 'company_name', 'feedback_link'
-            ],
-            'welcome_customer': [
-                'customer_name', 'customer_email', 'company_name',
-                'contact_phone', 'website_url'
-            ]
-        }
-        return placeholders.get(self.template_type, [])
+        return _PLACEHOLDERS.get(self.template_type, ())
 
 
 class NotificationLog(models.Model):
@@ -334,14 +470,53 @@ class NotificationLog(models.Model):
             models.Index(fields=['job', 'created_at']),
             models.Index(fields=['customer', 'created_at']),
             models.Index(fields=['technician', 'created_at']),
-            models.Index(fields=['status', 'created_at']),
-            models.Index(fields=['notification_type', 'status']),
+            # Worker sweeps filter by status and type, then range on created_at
+            models.Index(fields=['status', 'notification_type', 'created_at'], name='nl_stn_ct'),
+            # Partial index for the retry sweep (see due_for_retry)
+            models.Index(
+                fields=['next_retry_at'],
+                name='nl_retry_pending',
+                condition=models.Q(status__in=['failed', 'bounced'])
+            ),
         ]
 
     def __str__(self):
         recipient = self.recipient_email or self.recipient_phone
         return f"{self.get_notification_type_display()} to {recipient} - {self.get_status_display()}"
 
+    @classmethod
+    def due_for_retry(cls):
+        """
+        Rows of failed/bounced notifications whose retry time has come and
+        that have retries left, as (id, notification_type) values.
+        """
+        return cls.objects.filter(
+            status__in=['failed', 'bounced'],
+            next_retry_at__lte=timezone.now(),
+            retry_count__lt=models.F('max_retries')
+        ).order_by().values('id', 'notification_type')
+
+    @classmethod
+    def cleanup(cls, days, batch_size=10000):
+        """
+        Delete logs older than the given number of days in primary key
+        ranges, keeping each DELETE (and its transaction) short.
+        Returns the number of deleted rows.
+        """
+        cutoff = timezone.now() - timezone.timedelta(days=days)
+        old_logs = cls.objects.filter(created_at__lt=cutoff).order_by()
+        bounds = old_logs.aggregate(first=models.Min('pk'), last=models.Max('pk'))
+        if bounds['first'] is None:
+            return 0
+
+        deleted_total = 0
+        for start in range(bounds['first'], bounds['last'] + 1, batch_size):
+            # Nothing references the log table and it has no delete signal
+            # receivers, so each range is a single fast DELETE
+            deleted, _ = old_logs.filter(pk__gte=start, pk__lt=start + batch_size).delete()
+            deleted_total += deleted
+        return deleted_total
+
     def can_retry(self):
         """Check if this notification can be retried."""
         return (
@@ -350,82 +525,93 @@ class NotificationLog(models.Model):
             (self.next_retry_at is None or self.next_retry_at <= timezone.now())
         )
 
+    def _update_fields(self, **fields):
+        """Write only the given columns (plus updated_at) and mirror plain values on self."""
+        fields['updated_at'] = timezone.now()
+        type(self).objects.filter(pk=self.pk).update(**fields)
+        for name, value in fields.items():
+            if not hasattr(value, 'resolve_expression'):
+                setattr(self, name, value)
+
     def mark_as_sent(self, external_id=None):
         """Mark notification as sent."""
-        self.status = 'sent'
-        self.sent_at = timezone.now()
+        fields = {'status': 'sent', 'sent_at': timezone.now()}
         if external_id:
-            self.external_id = external_id
-        self.save()
+            fields['external_id'] = external_id
+        self._update_fields(**fields)
 
     def mark_as_delivered(self):
         """Mark notification as delivered."""
-        self.status = 'delivered'
-        self.delivered_at = timezone.now()
-        self.save()
+        self._update_fields(status='delivered', delivered_at=timezone.now())
 
     def mark_as_failed(self, error_message=None):
         """Mark notification as failed."""
-        self.status = 'failed'
+        fields = {'status': 'failed'}
         if error_message:
-            self.error_message = error_message
-        self.retry_count += 1
-
-        # Schedule next retry with exponential backoff
-        if self.retry_count < self.max_retries:
-            delay_minutes = 2 ** self.retry_count  # 2, 4, 8 minutes
-            self.next_retry_at = timezone.now() + timezone.timedelta(minutes=delay_minutes)
+            fields['error_message'] = error_message
+        now = timezone.now()
+
+        # Schedule next retry with exponential backoff (2, 4, 8 minutes), picked
+        # from the stored retry_count in the same UPDATE that increments it
+        backoff = {
+            retry_count: now + timezone.timedelta(minutes=2 ** (retry_count + 1))
+            for retry_count in range(self.max_retries - 1)
+        }
+        fields['next_retry_at'] = models.Case(
+            *[models.When(retry_count=retry_count, then=models.Value(retry_at))
+              for retry_count, retry_at in backoff.items()],
+            default=models.F('next_retry_at'),
+            output_field=models.DateTimeField()
+        )
+        self._update_fields(retry_count=models.F('retry_count') + 1, **fields)
 
-        self.save()
+        # Mirror the database values on this instance
+        self.next_retry_at = backoff.get(self.retry_count, self.next_retry_at)
+        self.retry_count += 1
 
     def mark_as_bounced(self, error_message=None):
         """Mark notification as bounced (permanent failure)."""
-        self.status = 'bounced'
+        fields = {'status': 'bounced'}
         if error_message:
-            self.error_message = error_message
-        self.save()
+            fields['error_message'] = error_message
+        self._update_fields(**fields)
 
 
-class NotificationSettings(models.Model):
-    """
-    Global notification settings and configurations.
-    """
+@dataclass(frozen=True)
+class NotificationServiceConfig:
+    """Twilio and SendGrid credentials, read from the Django settings."""
+    twilio_account_sid: str
+    twilio_auth_token: str
+    twilio_phone_number: str
+    sendgrid_api_key: str
+    sendgrid_from_email: str
+    sendgrid_from_name: str
 
-    # Service configurations
-    twilio_account_sid = models.CharField(
-        max_length=100,
-        blank=True,
-        help_text='Twilio Account SID'
-    )
+    @property
+    def twilio_configured(self):
+        return bool(self.twilio_account_sid and self.twilio_auth_token and self.twilio_phone_number)
 
-    twilio_auth_token = models.CharField(
-        max_length=100,
-        blank=True,
-        help_text='Twilio Auth Token'
-    )
+    @property
+    def sendgrid_configured(self):
+        return bool(self.sendgrid_api_key and self.sendgrid_from_email)
 
-    twilio_phone_number = models.CharField(
-        max_length=20,
-        blank=True,
-        help_text='Twilio phone number for sending SMS'
-    )
 
-    sendgrid_api_key = models.CharField(
-        max_length=200,
-        blank=True,
-        help_text='SendGrid API Key'
+@lru_cache(maxsize=None)
+def _load_service_config():
+    return NotificationServiceConfig(
+        twilio_account_sid=getattr(settings, 'TWILIO_ACCOUNT_SID', ''),
+        twilio_auth_token=getattr(settings, 'TWILIO_AUTH_TOKEN', ''),
+        twilio_phone_number=getattr(settings, 'TWILIO_PHONE_NUMBER', ''),
+        sendgrid_api_key=getattr(settings, 'SENDGRID_API_KEY', ''),
+        sendgrid_from_email=getattr(settings, 'SENDGRID_FROM_EMAIL', ''),
+        sendgrid_from_name=getattr(settings, 'SENDGRID_FROM_NAME', ''),
     )
 
-    sendgrid_from_email = models.EmailField(
-        blank=True,
-        help_text='Default from email address for SendGrid'
-    )
 
-    sendgrid_from_name = models.CharField(
-        max_length=100,
-        blank=True,
-        help_text='Default from name for SendGrid'
-    )
+class NotificationSettings(models.Model):
+    """
+    Global notification settings and configurations.
+    """
 
     # Global settings
     enable_sms_notifications = models.BooleanField(
@@ -492,6 +678,13 @@ class NotificationSettings(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    CACHE_KEY = 'notifications:settings'
+    # Also bounds staleness in other processes when the cache is not shared
+    CACHE_TIMEOUT = 300
+
+    # The primary key enforces the singleton at the database level
+    SINGLETON_PK = 1
+
     class Meta:
         verbose_name = 'Notification Settings'
         verbose_name_plural = 'Notification Settings'
@@ -499,13 +692,51 @@ class NotificationSettings(models.Model):
     def __str__(self):
         return "Global Notification Settings"
 
+    def save(self, *args, **kwargs):
+        self.pk = self.SINGLETON_PK
+        super().save(*args, **kwargs)
+
     @classmethod
     def get_settings(cls):
-        """Get the global notification settings (singleton pattern)."""
-        settings_obj, created = cls.objects.get_or_create(
-            defaults={
-                'company_name': 'Roofing Platform',
-                'default_timezone': 'America/New_York',
-            }
-        )
+        """
+        Get the global notification settings (singleton pattern).
+        Cached and cleared by the notifications signals.
+        """
+        settings_obj = cache.get(cls.CACHE_KEY)
+        if settings_obj is None:
+            if not cls.objects.filter(pk=cls.SINGLETON_PK).exists():
+                cls._adopt_existing_row()
+            settings_obj, created = cls.objects.get_or_create(
+                pk=cls.SINGLETON_PK,
+                defaults={
+                    'company_name': 'Roofing Platform',
+                    'default_timezone': 'America/New_York',
+                }
+            )
+            cache.set(cls.CACHE_KEY, settings_obj, cls.CACHE_TIMEOUT)
         return settings_obj
+
+    @classmethod
+    def _adopt_existing_row(cls):
+        """
+        Move a settings row saved under another primary key (before the
+        singleton key was fixed) to SINGLETON_PK, keeping its values.
+        If there are several, the most recently updated one is used.
+        """
+        with transaction.atomic():
+            existing = cls.objects.select_for_update().order_by('-updated_at').first()
+            if existing is not None:
+                cls.objects.filter(pk=existing.pk).update(id=cls.SINGLETON_PK)
+
+    @classmethod
+    def clear_cache(cls):
+        """Drop the cached settings instance"""
+        cache.delete(cls.CACHE_KEY)
+
+    @staticmethod
+    def get_service_config():
+        """
+        Return the SMS/email service credentials. Secrets live in the
+        environment, not in this table; the result is cached per process.
+        """
+        return _load_service_config()
@@ -6,7 +6,7 @@ class NotificationTemplateSerializer(serializers.ModelSerializer):
     """
     Serializer for NotificationTemplate model.
     """
-    available_placeholders = serializers.ReadOnlyField()
+    available_placeholders = serializers.ReadOnlyField(source='get_available_placeholders')
 
     class Meta:
         model = NotificationTemplate
@@ -79,9 +79,7 @@ class NotificationSettingsSerializer(serializers.ModelSerializer):
     class Meta:
         model = NotificationSettings
         fields = [
-            'id', 'twilio_account_sid', 'twilio_auth_token', 'twilio_phone_number',
-            'sendgrid_api_key', 'sendgrid_from_email', 'sendgrid_from_name',
-            'enable_sms_notifications', 'enable_email_notifications', 'default_timezone',
+            'id', 'enable_sms_notifications', 'enable_email_notifications', 'default_timezone',
             'company_name', 'company_phone', 'company_website',
             'enable_appointment_reminders', 'reminder_hours_before',
             'enable_job_status_notifications', 'enable_technician_notifications',
@@ -89,30 +87,6 @@ class NotificationSettingsSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
 
-    def validate(self, data):
-        """Validate notification settings."""
-        # Validate Twilio settings
-        twilio_fields = ['twilio_account_sid', 'twilio_auth_token', 'twilio_phone_number']
-        twilio_provided = any(data.get(field) for field in twilio_fields)
-        twilio_complete = all(data.get(field) for field in twilio_fields)
-
-        if twilio_provided and not twilio_complete:
-            raise serializers.ValidationError({
-                'twilio': 'All Twilio fields (Account SID, Auth Token, Phone Number) must be provided together.'
-            })
-
-        # Validate SendGrid settings
-        sendgrid_fields = ['sendgrid_api_key', 'sendgrid_from_email']
-        sendgrid_provided = any(data.get(field) for field in sendgrid_fields)
-        sendgrid_complete = all(data.get(field) for field in sendgrid_fields)
-
-        if sendgrid_provided and not sendgrid_complete:
-            raise serializers.ValidationError({
-                'sendgrid': 'Both SendGrid API Key and From Email must be provided.'
-            })
-
-        return data
-
 
 class BulkNotificationSerializer(serializers.Serializer):
     """
@@ -1,6 +1,9 @@
 import logging
+from functools import lru_cache
 from typing import Dict, List, Optional, Any
 from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
 from django.utils import timezone
 from django.template import Template, Context
 from .models import NotificationTemplate, NotificationLog, NotificationSettings
@@ -8,13 +11,68 @@ from .models import NotificationTemplate, NotificationLog, NotificationSettings
 logger = logging.getLogger(__name__)
 
 
+def scheduled_between(start, end):
+    """
+    Q for jobs whose scheduled_date/scheduled_time falls in [start, end).
+    A window that crosses midnight is split across the two dates.
+    """
+    if start.date() == end.date():
+        return Q(scheduled_date=start.date(), scheduled_time__gte=start.time(), scheduled_time__lt=end.time())
+    return (
+        Q(scheduled_date=start.date(), scheduled_time__gte=start.time()) |
+        Q(scheduled_date=end.date(), scheduled_time__lt=end.time())
+    )
+
+
+@lru_cache(maxsize=1)
+def _twilio_client(account_sid, auth_token):
+    """
+    Twilio client reused across sends so its pooled HTTPS session stays
+    open. Keyed on the credentials, so rotating them builds a new client.
+    """
+    from twilio.rest import Client
+    return Client(account_sid, auth_token)
+
+
+@lru_cache(maxsize=1)
+def _sendgrid_client(api_key):
+    """SendGrid client reused across sends, keyed on the API key."""
+    import sendgrid
+    return sendgrid.SendGridAPIClient(api_key=api_key)
+
+
 class NotificationService:
     """
     Service for managing and sending notifications.
     """
 
+    # Rows per INSERT when saving bulk notification logs
+    BULK_CREATE_BATCH_SIZE = 1000
+
+    # Columns the bulk loops read for context and recipients
+    BULK_JOB_FIELDS = (
+        'id', 'job_number', 'title', 'job_type', 'status', 'scheduled_date',
+        'scheduled_time', 'address', 'estimated_cost', 'special_instructions',
+        'customer', 'customer__email', 'customer__phone_number'
+    )
+    BULK_CUSTOMER_FIELDS = (
+        'id', 'first_name', 'last_name', 'email', 'phone_number', 'alt_phone_number'
+    )
+    BULK_TECHNICIAN_FIELDS = (
+        'id', 'user', 'user__first_name', 'user__last_name', 'user__email', 'user__phone_number'
+    )
+
+    # Context keys that differ per technician on a job
+    TECHNICIAN_PLACEHOLDERS = frozenset({'technician_name', 'technician_email', 'technician_phone'})
+
     def __init__(self):
         self.settings = NotificationSettings.get_settings()
+        # Shared by every context this service builds
+        self.company_context = {
+            'company_name': self.settings.company_name,
+            'company_phone': self.settings.company_phone,
+            'company_website': self.settings.company_website,
+        }
 
     def send_notification(
         self,
@@ -26,21 +84,18 @@ class NotificationService:
         job=None,
         customer=None,
         technician=None,
-        created_by=None
+        created_by=None,
+        template: NotificationTemplate = None
     ) -> NotificationLog:
         """
         Send a notification using the specified template.
+        Callers that already hold the template can pass it to skip the lookup.
         """
-        try:
-            # Get the template
-            template = NotificationTemplate.objects.get(
-                template_type=template_type,
-                notification_method=notification_method,
-                is_active=True
-            )
-        except NotificationTemplate.DoesNotExist:
-            logger.error(f"Template not found: {template_type} - {notification_method}")
-            return None
+        if template is None:
+            template = NotificationTemplate.active_map().get((template_type, notification_method))
+            if template is None:
+                logger.error(f"Template not found: {template_type} - {notification_method}")
+                return None
 
         # Prepare context data
         context = self._prepare_context_data(context_data or {}, job, customer, technician)
@@ -60,18 +115,17 @@ class NotificationService:
             technician=technician,
             notification_type=notification_method,
             template=template,
-            recipient_email=recipient_email,
-            recipient_phone=recipient_phone,
+            recipient_email=recipient_email or '',
+            recipient_phone=recipient_phone or '',
             subject=subject,
             content=content,
             created_by=created_by
         )
 
-        # Send the notification asynchronously
-        if notification_method == 'sms':
-            self._send_sms_notification.delay(notification_log.id)
-        elif notification_method == 'email':
-            self._send_email_notification.delay(notification_log.id)
+        # Send the notification asynchronously once the log row is committed;
+        # a broker error is logged and leaves the row pending
+        from .tasks import send_notification_task
+        transaction.on_commit(lambda: send_notification_task.delay(notification_log.id), robust=True)
 
         return notification_log
 
@@ -100,30 +154,38 @@ class NotificationService:
             logger.error(f"Template not found: {template_id}")
             return []
 
+        now = timezone.now()
+
         # Process jobs
         if job_ids:
-            jobs = Job.objects.filter(id__in=job_ids).select_related('customer')
+            jobs = Job.objects.filter(id__in=job_ids).select_related('customer').only(
+                *self.BULK_JOB_FIELDS
+            ).prefetch_related('assigned_technicians__user')
             for job in jobs:
-                context = self._prepare_context_data(context_overrides or {}, job=job)
-                notifications.extend(self._create_notifications_for_job(
+                context = self._prepare_context_data(context_overrides or {}, job=job, now=now)
+                notifications.extend(self._build_notifications_for_job(
                     job, template, context, created_by
                 ))
 
         # Process customers
         if customer_ids:
-            customers = Customer.objects.filter(id__in=customer_ids)
+            customers = Customer.objects.filter(id__in=customer_ids).only(
+                *self.BULK_CUSTOMER_FIELDS
+            ).prefetch_related('addresses')
             for customer in customers:
-                context = self._prepare_context_data(context_overrides or {}, customer=customer)
-                notifications.extend(self._create_notifications_for_customer(
+                context = self._prepare_context_data(context_overrides or {}, customer=customer, now=now)
+                notifications.extend(self._build_notifications_for_customer(
                     customer, template, context, created_by
                 ))
 
         # Process technicians
         if technician_ids:
-            technicians = TechnicianProfile.objects.filter(id__in=technician_ids).select_related('user')
+            technicians = TechnicianProfile.objects.filter(id__in=technician_ids).select_related('user').only(
+                *self.BULK_TECHNICIAN_FIELDS
+            )
             for technician in technicians:
-                context = self._prepare_context_data(context_overrides or {}, technician=technician)
-                notifications.extend(self._create_notifications_for_technician(
+                context = self._prepare_context_data(context_overrides or {}, technician=technician, now=now)
+                notifications.extend(self._build_notifications_for_technician(
                     technician, template, context, created_by
                 ))
 
@@ -134,42 +196,88 @@ class NotificationService:
                     {**(context_overrides or {}), **recipient.get('context', {})},
                     recipient.get('job'),
                     recipient.get('customer'),
-                    recipient.get('technician')
+                    recipient.get('technician'),
+                    now=now
                 )
 
-                notification_log = NotificationLog.objects.create(
+                notification_log = NotificationLog(
                     job=recipient.get('job'),
                     customer=recipient.get('customer'),
                     technician=recipient.get('technician'),
                     notification_type=template.notification_method,
                     template=template,
-                    recipient_email=recipient.get('email'),
-                    recipient_phone=recipient.get('phone'),
+                    recipient_email=recipient.get('email') or '',
+                    recipient_phone=recipient.get('phone') or '',
                     subject=template.render_subject(context),
                     content=template.render_content(context),
                     created_by=created_by
                 )
                 notifications.append(notification_log)
 
-        # Send notifications asynchronously
-        for notification in notifications:
-            if notification.notification_type == 'sms':
-                self._send_sms_notification.delay(notification.id)
-            elif notification.notification_type == 'email':
-                self._send_email_notification.delay(notification.id)
+        self._save_and_dispatch(notifications)
+        return notifications
 
+    def send_job_customer_notifications(self, jobs, template, context_data=None, created_by=None) -> List[NotificationLog]:
+        """
+        Send one template to the customer of each job. The logs are saved in
+        one bulk insert and their sends are queued together once that insert
+        is committed. Jobs should have their customer loaded.
+        """
+        notifications = []
+        now = timezone.now()
+
+        for job in jobs:
+            context = self._prepare_context_data(context_data or {}, job, job.customer, now=now)
+            try:
+                content = template.render_content(context)
+                subject = template.render_subject(context)
+            except Exception as e:
+                logger.error(f"Template rendering failed for job {job.job_number}: {e}")
+                continue
+
+            notifications.append(NotificationLog(
+                job=job,
+                customer=job.customer,
+                notification_type=template.notification_method,
+                template=template,
+                recipient_email=job.customer.email if template.notification_method == 'email' else '',
+                recipient_phone=job.customer.phone_number if template.notification_method == 'sms' else '',
+                subject=subject,
+                content=content,
+                created_by=created_by
+            ))
+
+        self._save_and_dispatch(notifications)
         return notifications
 
-    def _prepare_context_data(self, context_data: Dict[str, Any], job=None, customer=None, technician=None) -> Dict[str, Any]:
+    def _save_and_dispatch(self, notifications: List[NotificationLog]):
+        """
+        Save unsaved logs in a few multi-row INSERTs (primary keys are
+        returned) and, once the rows are committed, queue their sends as one
+        Celery group published over a single broker connection.
+        """
+        if not notifications:
+            return
+
+        from celery import group
+        from .tasks import send_notification_task
+
+        NotificationLog.objects.bulk_create(notifications, batch_size=self.BULK_CREATE_BATCH_SIZE)
+        sends = group([send_notification_task.s(notification.id) for notification in notifications])
+        # robust: a broker error is logged and leaves the rows pending
+        transaction.on_commit(lambda: sends.apply_async(), robust=True)
+
+    def _prepare_context_data(self, context_data: Dict[str, Any], job=None, customer=None, technician=None, now=None) -> Dict[str, Any]:
         """
         Prepare context data for template rendering.
+        Bulk callers pass one `now` so every recipient shares the same timestamp.
         """
+        if now is None:
+            now = timezone.now()
         context = {
-            'company_name': self.settings.company_name,
-            'company_phone': self.settings.company_phone,
-            'company_website': self.settings.company_website,
-            'current_date': timezone.now().date(),
-            'current_time': timezone.now().time(),
+            **self.company_context,
+            'current_date': now.date(),
+            'current_time': now.time(),
         }
 
         # Add job data
@@ -188,11 +296,12 @@ class NotificationService:
 
         # Add customer data
         if customer:
+            primary_address = customer.primary_address
             context.update({
                 'customer_name': customer.get_full_name(),
                 'customer_email': customer.email,
                 'customer_phone': customer.phone_number or customer.alt_phone_number,
-                'customer_address': customer.primary_address.get_full_address() if customer.primary_address else '',
+                'customer_address': primary_address.get_full_address() if primary_address else '',
             })
 
         # Add technician data
@@ -208,60 +317,71 @@ class NotificationService:
 
         return context
 
-    def _create_notifications_for_job(self, job, template, context, created_by) -> List[NotificationLog]:
-        """Create notifications for a job based on template settings."""
+    def _build_notifications_for_job(self, job, template, context, created_by) -> List[NotificationLog]:
+        """Build unsaved notifications for a job based on template settings."""
         notifications = []
+        rendered = None
 
         # Customer notifications
         if template.send_to_customer and job.customer:
-            notification_log = NotificationLog.objects.create(
+            rendered = (template.render_subject(context), template.render_content(context))
+            notification_log = NotificationLog(
                 job=job,
                 customer=job.customer,
                 notification_type=template.notification_method,
                 template=template,
-                recipient_email=job.customer.email if template.notification_method == 'email' else None,
-                recipient_phone=job.customer.phone_number if template.notification_method == 'sms' else None,
-                subject=template.render_subject(context),
-                content=template.render_content(context),
+                recipient_email=job.customer.email if template.notification_method == 'email' else '',
+                recipient_phone=job.customer.phone_number if template.notification_method == 'sms' else '',
+                subject=rendered[0],
+                content=rendered[1],
                 created_by=created_by
             )
             notifications.append(notification_log)
 
         # Technician notifications
         if template.send_to_technician:
+            # Without technician placeholders every technician gets the same text
+            per_technician = template.uses_placeholders(self.TECHNICIAN_PLACEHOLDERS)
+            if not per_technician and rendered is None:
+                rendered = (template.render_subject(context), template.render_content(context))
+
             for technician in job.assigned_technicians.all():
-                tech_context = context.copy()
-                tech_context.update({
-                    'technician_name': technician.full_name,
-                    'technician_email': technician.user.email,
-                    'technician_phone': technician.user.phone_number,
-                })
-
-                notification_log = NotificationLog.objects.create(
+                if per_technician:
+                    tech_context = context.copy()
+                    tech_context.update({
+                        'technician_name': technician.full_name,
+                        'technician_email': technician.user.email,
+                        'technician_phone': technician.user.phone_number,
+                    })
+                    subject, content = template.render_subject(tech_context), template.render_content(tech_context)
+                else:
+                    subject, content = rendered
+
+                notification_log = NotificationLog(
                     job=job,
                     technician=technician,
                     notification_type=template.notification_method,
                     template=template,
-                    recipient_email=technician.user.email if template.notification_method == 'email' else None,
-                    recipient_phone=technician.user.phone_number if template.notification_method == 'sms' else None,
-                    subject=template.render_subject(tech_context),
-                    content=template.render_content(tech_context),
+                    recipient_email=technician.user.email if template.notification_method == 'email' else '',
+                    recipient_phone=technician.user.phone_number if template.notification_method == 'sms' else '',
+                    subject=subject,
+                    content=content,
                     created_by=created_by
                 )
                 notifications.append(notification_log)
 
         return notifications
 
-    def _create_notifications_for_customer(self, customer, template, context, created_by) -> List[NotificationLog]:
-        """Create notifications for a customer."""
+    def _build_notifications_for_customer(self, customer, template, context, created_by) -> List[NotificationLog]:
+        """Build an unsaved notification for a customer."""
         notifications = []
 
-        notification_log = NotificationLog.objects.create(
+        notification_log = NotificationLog(
             customer=customer,
             notification_type=template.notification_method,
             template=template,
-            recipient_email=customer.email if template.notification_method == 'email' else None,
-            recipient_phone=customer.phone_number if template.notification_method == 'sms' else None,
+            recipient_email=customer.email if template.notification_method == 'email' else '',
+            recipient_phone=customer.phone_number if template.notification_method == 'sms' else '',
             subject=template.render_subject(context),
             content=template.render_content(context),
             created_by=created_by
@@ -270,16 +390,16 @@ class NotificationService:
 
         return notifications
 
-    def _create_notifications_for_technician(self, technician, template, context, created_by) -> List[NotificationLog]:
-        """Create notifications for a technician."""
+    def _build_notifications_for_technician(self, technician, template, context, created_by) -> List[NotificationLog]:
+        """Build an unsaved notification for a technician."""
         notifications = []
 
-        notification_log = NotificationLog.objects.create(
+        notification_log = NotificationLog(
             technician=technician,
             notification_type=template.notification_method,
             template=template,
-            recipient_email=technician.user.email if template.notification_method == 'email' else None,
-            recipient_phone=technician.user.phone_number if template.notification_method == 'sms' else None,
+            recipient_email=technician.user.email if template.notification_method == 'email' else '',
+            recipient_phone=technician.user.phone_number if template.notification_method == 'sms' else '',
             subject=template.render_subject(context),
             content=template.render_content(context),
             created_by=created_by
@@ -294,23 +414,18 @@ class NotificationService:
         Send SMS via Twilio.
         """
         try:
-            from twilio.rest import Client
             from notifications.models import NotificationSettings
 
-            settings = NotificationSettings.get_settings()
+            config = NotificationSettings.get_service_config()
 
-            if not all([
-                settings.twilio_account_sid,
-                settings.twilio_auth_token,
-                settings.twilio_phone_number
-            ]):
+            if not config.twilio_configured:
                 raise ValueError("Twilio settings not configured")
 
-            client = Client(settings.twilio_account_sid, settings.twilio_auth_token)
+            client = _twilio_client(config.twilio_account_sid, config.twilio_auth_token)
 
             message_obj = client.messages.create(
                 body=message,
-                from_=settings.twilio_phone_number,
+                from_=config.twilio_phone_number,
                 to=to_phone
             )
 
@@ -333,23 +448,19 @@ class NotificationService:
         Send email via SendGrid.
         """
         try:
-            import sendgrid
             from sendgrid.helpers.mail import Mail, Email, To, Content
             from notifications.models import NotificationSettings
 
-            settings = NotificationSettings.get_settings()
+            config = NotificationSettings.get_service_config()
 
-            if not all([
-                settings.sendgrid_api_key,
-                settings.sendgrid_from_email
-            ]):
+            if not config.sendgrid_configured:
                 raise ValueError("SendGrid settings not configured")
 
-            sg = sendgrid.SendGridAPIClient(api_key=settings.sendgrid_api_key)
+            sg = _sendgrid_client(config.sendgrid_api_key)
 
-            from_email = Email(settings.sendgrid_from_email)
-            if settings.sendgrid_from_name:
-                from_email.name = settings.sendgrid_from_name
+            from_email = Email(config.sendgrid_from_email)
+            if config.sendgrid_from_name:
+                from_email.name = config.sendgrid_from_name
 
             to_email_obj = To(to_email)
             subject_obj = subject
@@ -372,51 +483,6 @@ class NotificationService:
                 'error': str(e)
             }
 
-    @staticmethod
-    def _send_sms_notification(notification_id: int):
-        """
-        Celery task to send SMS notification.
-        """
-        try:
-            notification = NotificationLog.objects.get(id=notification_id)
-
-            if notification.recipient_phone and notification.content:
-                result = NotificationService.send_sms_via_twilio(
-                    notification.recipient_phone,
-                    notification.content
-                )
-
-                if result['success']:
-                    notification.mark_as_sent(result.get('external_id'))
-                else:
-                    notification.mark_as_failed(result.get('error'))
-
-        except Exception as e:
-            logger.error(f"SMS notification task failed: {e}")
-
-    @staticmethod
-    def _send_email_notification(notification_id: int):
-        """
-        Celery task to send email notification.
-        """
-        try:
-            notification = NotificationLog.objects.get(id=notification_id)
-
-            if notification.recipient_email and notification.content:
-                result = NotificationService.send_email_via_sendgrid(
-                    notification.recipient_email,
-                    notification.subject,
-                    notification.content
-                )
-
-                if result['success']:
-                    notification.mark_as_sent(result.get('external_id'))
-                else:
-                    notification.mark_as_failed(result.get('error'))
-
-        except Exception as e:
-            logger.error(f"Email notification task failed: {e}")
-
 
 # Global service instance
 notification_service = NotificationService()
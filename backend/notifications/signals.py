@@ -0,0 +1,21 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import NotificationTemplate, NotificationSettings
+
+
+@receiver(post_save, sender=NotificationTemplate)
+@receiver(post_delete, sender=NotificationTemplate)
+def clear_trigger_template_cache(sender, instance, **kwargs):
+    """
+    Invalidate the cached trigger template lists when a template changes.
+    """
+    NotificationTemplate.clear_trigger_cache()
+
+
+@receiver(post_save, sender=NotificationSettings)
+@receiver(post_delete, sender=NotificationSettings)
+def clear_settings_cache(sender, instance, **kwargs):
+    """
+    Invalidate the cached global settings when they change.
+    """
+    NotificationSettings.clear_cache()
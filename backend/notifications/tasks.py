@@ -1,11 +1,14 @@
 import logging
-from celery import shared_task
+from celery import group, shared_task
 from django.utils import timezone
 from .models import NotificationLog, NotificationTemplate, NotificationSettings
-from .services import NotificationService
+from .services import NotificationService, scheduled_between
 
 logger = logging.getLogger(__name__)
 
+# How long a queued retry stays out of the retry sweep
+RETRY_CLAIM_DELAY = timezone.timedelta(minutes=10)
+
 
 @shared_task(bind=True, max_retries=3)
 def send_notification_task(self, notification_id: int):
@@ -63,50 +66,140 @@ def send_scheduled_notifications():
         reminder_time = now + timezone.timedelta(hours=hours_before)
 
         jobs_needing_reminders = Job.objects.filter(
-            scheduled_date=reminder_time.date(),
-            scheduled_time__gte=reminder_time.time(),
-            scheduled_time__lt=(reminder_time + timezone.timedelta(minutes=30)).time(),
+            scheduled_between(reminder_time, reminder_time + timezone.timedelta(minutes=30)),
             status__in=['scheduled', 'dispatched']
-        ).select_related('customer')
-
-        for job in jobs_needing_reminders:
-            try:
-                template = NotificationTemplate.objects.get(
-                    template_type='appointment_reminder',
-                    notification_method='sms',
-                    is_active=True
-                )
+        ).select_related('customer').prefetch_related('customer__addresses')
+
+        # Look the template up once for the whole batch
+        template = NotificationTemplate.active_map().get(('appointment_reminder', 'sms'))
+        if template is None:
+            logger.warning("Appointment reminder template not found")
+        else:
+            notification_service = NotificationService()
+            for job in jobs_needing_reminders:
+                try:
+                    notification_service.send_notification(
+                        'appointment_reminder',
+                        'sms',
+                        recipient_phone=job.customer.phone_number,
+                        job=job,
+                        customer=job.customer,
+                        context_data={'hours_until': hours_before},
+                        template=template
+                    )
+
+                    logger.info(f"Sent reminder for job {job.job_number}")
+
+                except Exception as e:
+                    logger.error(f"Failed to send reminder for job {job.job_number}: {e}")
+
+    # Check for failed notifications to retry
+    retry_ids = [notification['id'] for notification in NotificationLog.due_for_retry()]
+    if retry_ids:
+        # Push the claimed rows out of the retry window in one UPDATE so the
+        # next sweep doesn't queue them again while these sends are pending;
+        # a failed send reschedules itself through mark_as_failed
+        NotificationLog.objects.filter(id__in=retry_ids).update(
+            next_retry_at=now + RETRY_CLAIM_DELAY,
+            updated_at=now
+        )
+        group(send_notification_task.s(notification_id) for notification_id in retry_ids).apply_async()
+
+
+@shared_task
+def dispatch_job_notifications(job_id: int, created: bool, old_status: str = None, new_status: str = None):
+    """
+    Send job created / status change notifications (queued from jobs.signals).
+    """
+    from jobs.models import Job
+
+    try:
+        job = Job.objects.select_related('customer').prefetch_related(
+            'assigned_technicians__user'
+        ).get(id=job_id)
+    except Job.DoesNotExist:
+        logger.error(f"Job {job_id} not found for notifications")
+        return
+
+    if created:
+        _send_job_created_notifications(job)
+    else:
+        _send_job_status_notifications(job, old_status, new_status)
+
 
-                notification_service = NotificationService()
+def _send_job_created_notifications(job):
+    """
+    Send notifications when a job is created.
+    """
+    from .services import notification_service
+
+    templates = NotificationTemplate.get_trigger_templates('job_create')
+
+    for template in templates:
+        try:
+            notification_service.send_notification(
+                template.template_type,
+                template.notification_method,
+                recipient_phone=job.customer.phone_number if template.send_to_customer else None,
+                recipient_email=job.customer.email if template.send_to_customer and template.notification_method == 'email' else None,
+                job=job,
+                customer=job.customer,
+                template=template
+            )
+        except Exception:
+            # Log error but keep sending the remaining templates
+            logger.exception(f"Failed to send job created notification for job {job.job_number}")
+
+
+def _send_job_status_notifications(job, old_status, new_status):
+    """
+    Send notifications when job status changes.
+    """
+    from .services import notification_service
+
+    templates = NotificationTemplate.get_status_change_templates(new_status)
+    if not templates:
+        return
+
+    # Evaluate the assigned technicians once for all templates
+    technicians = list(job.assigned_technicians.all())
+    status_context = {
+        'old_status': old_status,
+        'new_status': new_status
+    }
+
+    for template in templates:
+        try:
+            # Customer notifications
+            if template.send_to_customer and job.customer:
                 notification_service.send_notification(
-                    'appointment_reminder',
-                    'sms',
-                    recipient_phone=job.customer.phone_number,
+                    template.template_type,
+                    template.notification_method,
+                    recipient_phone=job.customer.phone_number if template.notification_method == 'sms' else None,
+                    recipient_email=job.customer.email if template.notification_method == 'email' else None,
                     job=job,
                     customer=job.customer,
-                    context_data={'hours_until': hours_before}
+                    context_data=status_context,
+                    template=template
                 )
 
-                logger.info(f"Sent reminder for job {job.job_number}")
-
-            except NotificationTemplate.DoesNotExist:
-                logger.warning("Appointment reminder template not found")
-            except Exception as e:
-                logger.error(f"Failed to send reminder for job {job.job_number}: {e}")
-
-    # Check for failed notifications to retry
-    failed_notifications = NotificationLog.objects.filter(
-        status__in=['failed', 'bounced'],
-        retry_count__lt=3,
-        next_retry_at__lte=now
-    )
-
-    for notification in failed_notifications:
-        if notification.can_retry():
-            if notification.notification_type == 'sms':
-                send_sms_notification.delay(notification.id)
-            elif notification.notification_type == 'email':
-                send_email_notification.delay(notification.id)
+            # Technician notifications
+            if template.send_to_technician:
+                for technician in technicians:
+                    notification_service.send_notification(
+                        template.template_type,
+                        template.notification_method,
+                        recipient_phone=technician.user.phone_number if template.notification_method == 'sms' else None,
+                        recipient_email=technician.user.email if template.notification_method == 'email' else None,
+                        job=job,
+                        technician=technician,
+                        context_data=status_context,
+                        template=template
+                    )
+
+        except Exception:
+            # Log error but keep sending the remaining templates
+            logger.exception(f"Failed to send job status notification for job {job.job_number}")
 
 
 @shared_task
@@ -115,13 +208,7 @@ def cleanup_old_notification_logs():
     Clean up old notification logs based on settings.
     """
     settings = NotificationSettings.get_settings()
-    days_to_keep = settings.cleanup_old_logs_days
-
-    cutoff_date = timezone.now() - timezone.timedelta(days=days_to_keep)
-
-    deleted_count, _ = NotificationLog.objects.filter(
-        created_at__lt=cutoff_date
-    ).delete()
+    deleted_count = NotificationLog.cleanup(settings.cleanup_old_logs_days)
 
     logger.info(f"Cleaned up {deleted_count} old notification logs")
 
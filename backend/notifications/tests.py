@@ -0,0 +1,29 @@
+from django.template import Context, Template
+from django.test import TestCase
+from .models import NotificationTemplate, _compile_template, _PlaceholderTemplate
+
+
+class NotificationTemplateRenderTestCase(TestCase):
+    """Test cases for NotificationTemplate rendering"""
+
+    def test_placeholders_render_without_template_engine(self):
+        """Test plain placeholder content uses the fast path"""
+        template = NotificationTemplate(content='Hi {{ customer_name }}, see you {{scheduled_date}}.')
+
+        self.assertIsInstance(_compile_template(template.content), _PlaceholderTemplate)
+        self.assertEqual(
+            template.render_content({'customer_name': 'Ana', 'scheduled_date': 'Monday'}),
+            'Hi Ana, see you Monday.'
+        )
+
+    def test_numeric_placeholder_renders_like_django_template(self):
+        """Test non-identifier names such as {{ 1 }} are not treated as placeholders"""
+        content = 'Ref {{ 1 }} for {{ customer_name }}'
+        context_data = {'customer_name': 'Ana'}
+        template = NotificationTemplate(content=content)
+
+        self.assertNotIsInstance(_compile_template(content), _PlaceholderTemplate)
+        self.assertEqual(
+            template.render_content(context_data),
+            Template(content).render(Context(context_data))
+        )
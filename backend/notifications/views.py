@@ -14,7 +14,7 @@ from .serializers import (
     BulkNotificationSerializer,
     NotificationTemplateTestSerializer
 )
-from .services import NotificationService
+from .services import NotificationService, scheduled_between
 from accounts.permissions import ManagerAndAbove
 
 
@@ -99,8 +99,18 @@ class NotificationLogListView(generics.ListAPIView):
 
     def get_queryset(self):
         """Filter notification logs"""
+        # Join only what NotificationLogSerializer renders (job is output as its id)
         queryset = NotificationLog.objects.select_related(
-            'job', 'customer', 'technician', 'template', 'created_by'
+            'customer', 'technician__user', 'template', 'created_by'
+        ).only(
+            'id', 'job', 'customer', 'technician', 'notification_type', 'template',
+            'recipient_email', 'recipient_phone', 'subject', 'content', 'status',
+            'sent_at', 'delivered_at', 'external_id', 'error_message', 'retry_count',
+            'max_retries', 'created_by', 'created_at', 'updated_at',
+            'customer__first_name', 'customer__last_name',
+            'technician__user', 'technician__user__first_name', 'technician__user__last_name',
+            'technician__user__username', 'template__name',
+            'created_by__first_name', 'created_by__last_name', 'created_by__username'
         )
 
         # Filter by type
@@ -141,8 +151,9 @@ class NotificationLogDetailView(generics.RetrieveAPIView):
     """
     Retrieve a notification log entry.
     """
+    # Same joins as the list view; technician_name reads technician.user
     queryset = NotificationLog.objects.select_related(
-        'job', 'customer', 'technician', 'template', 'created_by'
+        'customer', 'technician__user', 'template', 'created_by'
     )
     serializer_class = NotificationLogSerializer
     permission_classes = [ManagerAndAbove]
@@ -157,24 +168,18 @@ class NotificationStatsView(APIView):
     def get(self, request):
         """Get notification statistics"""
         today = timezone.now().date()
-
-        # Total counts
-        total_sent = NotificationLog.objects.filter(status='sent').count()
-        total_failed = NotificationLog.objects.filter(status__in=['failed', 'bounced']).count()
-        total_pending = NotificationLog.objects.filter(status='pending').count()
-
-        # Today's counts
-        sms_sent_today = NotificationLog.objects.filter(
-            notification_type='sms',
-            status='sent',
-            created_at__date=today
-        ).count()
-
-        email_sent_today = NotificationLog.objects.filter(
-            notification_type='email',
-            status='sent',
-            created_at__date=today
-        ).count()
+        sent_today = Q(status='sent', created_at__date=today)
+
+        # All counts in a single pass over the log table
+        counts = NotificationLog.objects.aggregate(
+            total_sent=Count('id', filter=Q(status='sent')),
+            total_failed=Count('id', filter=Q(status__in=['failed', 'bounced'])),
+            total_pending=Count('id', filter=Q(status='pending')),
+            sms_sent_today=Count('id', filter=sent_today & Q(notification_type='sms')),
+            email_sent_today=Count('id', filter=sent_today & Q(notification_type='email')),
+        )
+        total_sent = counts['total_sent']
+        total_failed = counts['total_failed']
 
         # Rates
         total_notifications = total_sent + total_failed
@@ -182,11 +187,7 @@ class NotificationStatsView(APIView):
         failure_rate = (total_failed / total_notifications * 100) if total_notifications > 0 else 0
 
         data = {
-            'total_sent': total_sent,
-            'total_failed': total_failed,
-            'total_pending': total_pending,
-            'sms_sent_today': sms_sent_today,
-            'email_sent_today': email_sent_today,
+            **counts,
             'delivery_rate': round(delivery_rate, 2),
             'failure_rate': round(failure_rate, 2),
         }
@@ -280,8 +281,8 @@ class TriggerNotificationView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        service = NotificationService()
-        sent_count = 0
+        jobs = []
+        context_data = None
 
         if trigger_type == 'job_status':
             # Send notifications for jobs with specific status
@@ -293,19 +294,9 @@ class TriggerNotificationView(APIView):
                 )
 
             from jobs.models import Job
-            jobs = Job.objects.filter(status=job_status).select_related('customer')
-
-            for job in jobs:
-                notification = service.send_notification(
-                    template_type,
-                    notification_method,
-                    recipient_phone=job.customer.phone_number,
-                    job=job,
-                    customer=job.customer,
-                    created_by=request.user
-                )
-                if notification:
-                    sent_count += 1
+            jobs = Job.objects.filter(status=job_status).select_related('customer').prefetch_related(
+                'customer__addresses'
+            )
 
         elif trigger_type == 'appointment_reminders':
             # Send appointment reminders for upcoming jobs
@@ -316,29 +307,22 @@ class TriggerNotificationView(APIView):
             reminder_time = timezone.now() + timezone.timedelta(hours=hours_before)
 
             jobs = Job.objects.filter(
-                scheduled_date=reminder_time.date(),
-                scheduled_time__range=(
-                    reminder_time.time(),
-                    (reminder_time + timezone.timedelta(minutes=30)).time()
-                ),
+                scheduled_between(reminder_time, reminder_time + timezone.timedelta(minutes=30)),
                 status__in=['scheduled', 'dispatched']
-            ).select_related('customer')
-
-            for job in jobs:
-                notification = service.send_notification(
-                    template_type,
-                    notification_method,
-                    recipient_phone=job.customer.phone_number,
-                    job=job,
-                    customer=job.customer,
-                    context_data={'hours_until': hours_before},
-                    created_by=request.user
-                )
-                if notification:
-                    sent_count += 1
+            ).select_related('customer').prefetch_related('customer__addresses')
+            context_data = {'hours_until': hours_before}
+
+        # Resolve the template once for the whole batch; without an active
+        # template nothing is sent, as with send_notification
+        template = NotificationTemplate.active_map().get((template_type, notification_method))
+        notifications = []
+        if template is not None:
+            notifications = NotificationService().send_job_customer_notifications(
+                jobs, template, context_data=context_data, created_by=request.user
+            )
 
         return Response({
-            'message': f'Sent {sent_count} notifications',
+            'message': f'Sent {len(notifications)} notifications',
             'trigger_type': trigger_type,
             'template_type': template_type
         })
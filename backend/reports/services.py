@@ -100,32 +100,24 @@ class ReportService:
         completion_rate = (completed_jobs / total_jobs * 100) if total_jobs > 0 else 0
 
         # Average completion time (for completed jobs)
-        completed_jobs_queryset = jobs.filter(
+        completed_durations = list(jobs.filter(
             status='completed',
             actual_start_time__isnull=False,
             actual_end_time__isnull=False
-        )
+        ).with_durations().values_list('actual_duration_db', 'estimated_duration_hours'))
 
         avg_completion_time = None
-        if completed_jobs_queryset.exists():
-            durations = []
-            for job in completed_jobs_queryset:
-                if job.actual_start_time and job.actual_end_time:
-                    duration = job.actual_end_time - job.actual_start_time
-                    durations.append(duration.total_seconds() / 3600)  # Convert to hours
-
-            if durations:
-                avg_completion_time = sum(durations) / len(durations)
+        durations = [duration.total_seconds() / 3600 for duration, _ in completed_durations]  # Convert to hours
+        if durations:
+            avg_completion_time = sum(durations) / len(durations)
 
         # On-time completion rate (completed within estimated time)
-        on_time_completions = 0
-        for job in completed_jobs_queryset:
-            if job.actual_start_time and job.actual_end_time and job.estimated_duration_hours:
-                actual_duration = (job.actual_end_time - job.actual_start_time).total_seconds() / 3600
-                if actual_duration <= job.estimated_duration_hours:
-                    on_time_completions += 1
-
-        on_time_rate = (on_time_completions / completed_jobs_queryset.count() * 100) if completed_jobs_queryset.count() > 0 else 0
+        on_time_completions = sum(
+            1 for hours, (_, estimated_hours) in zip(durations, completed_durations)
+            if estimated_hours and hours <= estimated_hours
+        )
+
+        on_time_rate = (on_time_completions / len(completed_durations) * 100) if completed_durations else 0
 
         # Weekly completion trends
         weekly_data = []
@@ -26,6 +26,16 @@ app.conf.beat_schedule = {
         'task': 'jobs.tasks.generate_daily_summary',
         'schedule': crontab(hour=18, minute=0),  # 6 PM daily
     },
+    # Flag jobs that became overdue at the date rollover
+    'refresh-overdue-jobs': {
+        'task': 'jobs.tasks.refresh_overdue_jobs',
+        'schedule': crontab(hour=0, minute=5),  # 12:05 AM daily
+    },
+    # Prune notification logs past the retention window
+    'cleanup-old-notification-logs': {
+        'task': 'notifications.tasks.cleanup_old_notification_logs',
+        'schedule': crontab(hour=3, minute=0),  # 3 AM daily
+    },
 }
 
 @app.task(bind=True)